@@ -0,0 +1,205 @@
+"""
+Hot path benchmarks. Run from the repository root:
+
+    python -m benchmarks.run [--frames N] [--json results.json]
+
+Every stage is timed per frame with perf_counter_ns and reported as
+p50/p99/max latency in microseconds plus the sustainable frames per second.
+No hardware is needed, keys go to a RecordingBackend.
+"""
+import argparse
+import json
+import platform
+import random
+import struct
+import time
+
+from src.utils.duml import DumlFramer, build_frame
+from src.utils.input_logic import ButtonBank, GestureRecognizer
+from src.utils.sequence import SequenceHandler, SequenceStep
+from src.remote_controller.dji_rcN1 import DJIRCN1
+from src.remote_controller.dji_m300 import DJIM300
+from src.keyboard.keyboard import KeyboardEmulator, KbAxis
+from src.keyboard.backends import RecordingBackend
+from src.keyboard.mapping import load_mappings, switch_mode
+
+DEADZONES = {'movement': 0.1, 'elevation': 0.1}
+
+
+def make_frames(count, size=38, seed=1):
+    """Random stick replies, complete with valid checksums."""
+    rng = random.Random(seed)
+    frames = []
+    for seq in range(count):
+        payload = bytearray(size - 13)
+        for offset in (13, 16, 19, 22, 25):
+            struct.pack_into('<H', payload, offset - 11, rng.randint(364, 1684))
+        frames.append(build_frame(0x06, 0x0a, seq, 0x80, 0x06, 0x01, payload))
+    return frames
+
+
+def make_emulator():
+    backend = RecordingBackend()
+    return KeyboardEmulator(emulate_hardware=True, print_events=False, backend=backend), backend
+
+
+def summarize(samples_ns, total_ns):
+    ordered = sorted(samples_ns)
+    n = len(ordered)
+    return {
+        'frames': n,
+        'p50_us': ordered[n // 2] / 1000,
+        'p99_us': ordered[min(n - 1, int(n * 0.99))] / 1000,
+        'max_us': ordered[-1] / 1000,
+        'fps': n / (total_ns / 1e9) if total_ns else 0.0,
+    }
+
+
+def run_stage(step, count):
+    clock = time.perf_counter_ns
+    samples = [0] * count
+    start = clock()
+    for i in range(count):
+        t0 = clock()
+        step(i)
+        samples[i] = clock() - t0
+    return summarize(samples, clock() - start)
+
+
+# --- Stages ---
+# Each returns a step(i) callable doing one frame of work.
+
+def stage_duml_decode(driver):
+    def setup(count):
+        layout = driver.LAYOUT
+        decoder = layout.compile(DEADZONES)
+        framer = DumlFramer(verify_crc=driver.VERIFY_CRC)
+        frames = make_frames(count)
+
+        def step(i):
+            framer.write(frames[i])
+            for frame in framer.frames():
+                if layout.matches(frame):
+                    decoder.decode(frame)
+        return step
+    return setup
+
+
+def stage_button_logic(count):
+    bank = ButtonBank([f'button{i}' for i in range(1, 5)])
+    gestures = GestureRecognizer()
+    gestures.add_hold_tap('forward_cruise', hold_mask=0b0001, tap_mask=0b1000)
+    gestures.add_double_tap('double_tap', 0b0010)
+    gestures.add_chord('chord', 0b0110)
+    seq = SequenceHandler()
+    seq.start_sequence([SequenceStep(duration=3600.0, axes_map={KbAxis.PITCH: 1.0})])
+    # Each button toggles with its own period so edges keep happening
+    pattern = [sum(((i // period) % 2) << bit for bit, period in enumerate((3, 7, 50, 200))) for i in range(count)]
+
+    def step(i):
+        bank.update(pattern[i], i * 0.01)
+        gestures.update(bank)
+        seq.update()
+    return step
+
+
+def stage_mapping(count):
+    """Built-in profile: source values + switches -> key mask and taps."""
+    emu, backend = make_emulator()
+    mappings = load_mappings(emu)
+    rng = random.Random(2)
+    values = [[rng.choice((-1.0, 0.0, 0.0, 1.0)) for _ in range(5)] for _ in range(count)]
+    modes = [switch_mode(rng.choice((-1, 0, 1)) if i % 50 == 0 else 1, 0) for i in range(count)]
+    previous = [0]
+
+    def step(i):
+        mode = modes[i]
+        program = mappings.select(mode)
+        program.fire_taps(emu, 0, mode, previous[0])
+        previous[0] = mode
+        emu.apply_axes(program.key_mask(values[i], mode))
+        emu.service()
+        if len(backend.events) > 100000:
+            backend.clear()
+    return step
+
+
+def stage_key_emission(count):
+    emu, backend = make_emulator()
+    on = emu.axis_mask(KbAxis.PITCH, 1.0) | emu.axis_mask(KbAxis.YAW, -1.0)
+
+    def step(i):
+        # Worst case: every frame flips keys
+        emu.apply_axes(on if i % 2 else 0)
+        if len(backend.events) > 100000:
+            backend.clear()
+    return step
+
+
+def stage_end_to_end(count):
+    """DUML frame in -> decoded sticks -> key events out (N1 layout)."""
+    layout = DJIRCN1.LAYOUT
+    decoder = layout.compile(DEADZONES)
+    framer = DumlFramer(verify_crc=DJIRCN1.VERIFY_CRC)
+    frames = make_frames(count, seed=3)
+    emu, backend = make_emulator()
+    axes = (KbAxis.ROLL, KbAxis.PITCH, KbAxis.THROTTLE, KbAxis.YAW, KbAxis.CAMERA_PITCH)
+
+    def step(i):
+        framer.write(frames[i])
+        for frame in framer.frames():
+            if layout.matches(frame):
+                sample = decoder.decode(frame)
+                axis_mask = emu.axis_mask
+                mask = 0
+                for axis, value in zip(axes, sample):
+                    mask |= axis_mask(axis, value)
+                emu.apply_axes(mask)
+        if len(backend.events) > 100000:
+            backend.clear()
+    return step
+
+
+STAGES = {
+    'duml_decode_n1':   stage_duml_decode(DJIRCN1),
+    'duml_decode_m300': stage_duml_decode(DJIM300),
+    'button_logic':     stage_button_logic,
+    'mapping':          stage_mapping,
+    'key_emission':     stage_key_emission,
+    'end_to_end':       stage_end_to_end,
+}
+
+
+def run(frames, only=None):
+    results = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'frames': frames,
+        'stages': {},
+    }
+    for name, setup in STAGES.items():
+        if only and name not in only:
+            continue
+        results['stages'][name] = run_stage(setup(frames), frames)
+    return results
+
+
+def print_table(results):
+    print(f"{'stage':<18} {'p50 us':>9} {'p99 us':>9} {'max us':>9} {'fps':>12}")
+    for name, r in results['stages'].items():
+        print(f"{name:<18} {r['p50_us']:>9.2f} {r['p99_us']:>9.2f} {r['max_us']:>9.2f} {r['fps']:>12.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='DJI RC hot path benchmarks')
+    parser.add_argument('--frames', type=int, default=20000, help='Frames per stage (default: 20000)')
+    parser.add_argument('--stage', action='append', choices=sorted(STAGES), help='Only run this stage (repeatable)')
+    parser.add_argument('--json', type=str, default=None, metavar='PATH', help='Also write the results as JSON')
+    args = parser.parse_args()
+
+    results = run(args.frames, only=args.stage)
+    print_table(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
@@ -1,51 +1,237 @@
+from src.utils.startup import PROFILE
 import time
 import argparse
-import serial.tools.list_ports
-from src.remote_controller.dji_rc3 import DJIRC3
-from src.remote_controller.dji_rcN1 import DJIRCN1
-from src.remote_controller.dji_m300 import DJIM300
-from src.remote_controller.base_rc import RCConnectionError
+from src.remote_controller.registry import DRIVERS, available_models, load_driver, model_of_class
+from src.remote_controller.connection import ConnectionManager
+from src.remote_controller.replay import ReplayController
+from src.utils.capture import CaptureReader
+from src.remote_controller.multi import MultiController, MERGE_POLICIES, OWNABLE
+from src.remote_controller.calibration import run_calibration
 
-from src.utils.sequence import SequenceHandler, SequenceStep
-from src.keyboard.keyboard import KeyboardEmulator, KbAxis, KbButton
+from src.utils.sequence import SequenceHandler, SequenceStep, Timeline, load_sequences
+from src.utils.input_logic import GestureRecognizer
+from src.utils.scheduler import FrameScheduler
+from src.utils.filters import build_filters
+from src.utils.metrics import Metrics, NullMetrics
+from src.utils import event_log
+from src.utils.event_log import log
+with PROFILE.measure("import keyboard (pynput)"):
+    from src.keyboard.keyboard import KeyboardEmulator, KbAxis, KbButton
+from src.keyboard.modulation import PwmModulator
+from src.keyboard.mapping import load_mappings, switch_mode, SOURCES, SLOT_ROLL, SLOT_PITCH, SLOT_THROTTLE, SLOT_YAW, SLOT_TILT
+from src.keyboard.backends import BACKENDS
 
 
 
-def main(model_choice):
-    print(f"--- DJI Universal Interface | Target: {model_choice} ---")
+# --filter choice -> smoothing of the AxisFilters
+FILTERS = {'hysteresis': None, 'ema': 'ema', 'one_euro': 'one_euro'}
+
+
+def member_spec(value):
+    """One --models entry: MODEL or MODEL:PORT."""
+    model, _, port = value.partition(':')
+    if model not in DRIVERS:
+        raise argparse.ArgumentTypeError(f"unknown model '{model}', expected one of {available_models()}")
+    if port and 'serial' not in DRIVERS[model].dependencies:
+        raise argparse.ArgumentTypeError(f"{model} is not a serial controller, it takes no port")
+    return model, port or None
+
+
+def owner_spec(value):
+    """One --owner entry: INPUT=INDEX."""
+    key, _, index = value.partition('=')
+    if key not in OWNABLE:
+        raise argparse.ArgumentTypeError(f"unknown input '{key}', expected one of {', '.join(OWNABLE)}")
+    if not index.isdigit():
+        raise argparse.ArgumentTypeError(f"expected INPUT=INDEX, got '{value}'")
+    return key, int(index)
 
-    rc = None
-    retry_limit = 15
 
-    for retry in range(retry_limit):
+def main(args):
+    # Several --models are merged into one controller, the first one has the highest priority
+    members = args.models or [(args.model, None)]
+    models = [model for model, _ in members]
+    if args.replay:
+        # A replay uses the thresholds of the model that was captured, not --model's
         try:
-            if model_choice == 'RC3':
-                rc = DJIRC3(joystick_index=0, deadzone_threshold_movement=0.3, deadzone_threshold_elevation=0.6)
-            elif model_choice == 'M300':
-                rc = DJIM300()
-            elif model_choice == 'N1':
-                rc = DJIRCN1()
-            
-            # If we reach this line, constructor succeeded
-            print(f"Successfully connected to {model_choice}!")
-            break 
-            
-        except RCConnectionError as e:
-            rc = None
-            print(f"Retrying... [{retry}/{retry_limit}] {e}")
-            time.sleep(1)
+            reader = CaptureReader(args.replay)
+        except (OSError, ValueError) as e:
+            print(f"Cannot replay {args.replay}: {e}")
+            return
+        captured = model_of_class(reader.model)
+        reader.close()
+        if captured is None:
+            print(f"Capture was recorded from unknown model '{reader.model}'")
+            return
+        members = [(captured, None)]
+        models = [captured]
+    model_choice = ' + '.join(models)
+    print(f"--- DJI Universal Interface | Target: {model_choice} ---")
+    if args.capture and len(models) > 1:
+        print("--capture records a single controller, use it without --models.")
+        return
+
+    # Deadzones (movement, elevation). With --filter the drivers pass raw values
+    # and the filter stage applies them with hysteresis instead (first model's thresholds).
+    def thresholds_for(model):
+        return {'RC3': (0.3, 0.6)}.get(model, (0.1, 0.1))
+
+    def deadzones_for(model):
+        movement, elevation = (0.0, 0.0) if args.filter else thresholds_for(model)
+        return dict(deadzone_threshold_movement=movement, deadzone_threshold_elevation=elevation)
+
+    deadzones = deadzones_for(models[0])
+    movement_dz, elevation_dz = thresholds_for(models[0])
+
+    serial_options = {}
+    if args.pipeline is not None:
+        serial_options['pipeline_depth'] = args.pipeline
+    if args.port:
+        serial_options['port'] = args.port
+    driver_options = {
+        'RC3': dict(joystick_index=0, event_driven=args.events, **deadzones_for('RC3')),
+        'M300': dict(serial_options, **deadzones_for('M300')),
+        'N1': dict(serial_options, **deadzones_for('N1')),
+    }
+
+    # Only the selected drivers (and their pygame/pyserial dependency) get imported
+    drivers = {} if args.replay else {model: load_driver(model, PROFILE) for model in models}
+
+    def create_single(model, port=None):
+        options = driver_options.get(model, {})
+        if port:
+            options = dict(options, port=port)
+        return drivers[model](**options)
+
+    def create_multi():
+        # Every controller gets its own connection manager, so one can reconnect while the others keep flying
+        connections = [(f"{model} ({port})" if port else model,
+                        ConnectionManager(lambda model=model, port=port: create_single(model, port),
+                                          background=DRIVERS[model].background_reconnect))
+                       for model, port in members]
+        # Takeover is judged against the movement deadzone, also when --filter leaves the drivers at 0
+        return MultiController(connections, policy=args.merge, owners=owners, activity_threshold=movement_dz)
+
+    owners = dict(args.owner)
+
+    create_controller = create_multi if len(models) > 1 else lambda: create_single(models[0])
 
-    k_emu = KeyboardEmulator(emulate_hardware=True, print_events=True)
+    def prepare_controller(new_rc, recorder=None):
+        # A reconnected controller keeps writing to the same capture file
+        if recorder is not None:
+            new_rc.recorder = recorder
+        elif args.capture:
+            new_rc.start_capture(args.capture)
+
+        if args.threaded and new_rc.supports_acquisition:
+            # Serial I/O moves to a reader thread, rc.update() only picks up the newest sample
+            new_rc.start_acquisition()
+
+    try:
+        with PROFILE.measure(f"init {args.output} keyboard backend"):
+            backend = BACKENDS[args.output]()
+    except OSError as e:
+        print(f"Cannot start the {args.output} keyboard backend: {e}")
+        return
+    k_emu = KeyboardEmulator(emulate_hardware=True, print_events=True, backend=backend,
+                             min_press=args.min_press, min_release=args.min_release, max_rate=args.max_key_rate)
+    if k_emu.pacer:
+        rate = f"{args.max_key_rate:g} events/s" if args.max_key_rate else "no rate limit"
+        print(f"Key pacing: press >= {args.min_press * 1000:.0f} ms, release >= {args.min_release * 1000:.0f} ms, {rate}")
+
+    # Stick/button -> key policy, compiled once from the profile file.
+    # Profiles and sequences are checked before connecting, a typo shouldn't wait for the controller.
+    # Hysteresis/smoothing between decode and key output, against key chatter
+    filters = None
+    try:
+        mappings = load_mappings(k_emu, args.profiles)
+        if args.filter:
+            filters = build_filters(SOURCES, movement_dz, elevation_dz, smoothing=FILTERS[args.filter],
+                                    dwell=args.dwell, overrides=mappings.filters)
+    except (OSError, ValueError) as e:
+        print(f"Invalid mapping profiles: {e}")
+        k_emu.close()
+        return
+    # Tap hold times from the "taps" section, every other tap keeps the default
+    k_emu.tap_hold_times.update(mappings.tap_holds)
+    if mappings.curves:
+        # Response curves live in the lookup tables of the serial drivers
+        for model in ('N1', 'M300'):
+            driver_options[model]['curves'] = mappings.curves
+        curves = ', '.join(f"{name} {exponent:g}" for name, exponent in mappings.curves.items())
+        print(f"Response curves: {curves}" + (" (not applied to the RC3)" if 'RC3' in models else ""))
+    program = None
+    values = [0.0] * 5  # Source values of the frame, SLOT_* order
+    if filters:
+        print(f"Axis filter: {args.filter}, enter {movement_dz}/{elevation_dz}, dwell {args.dwell * 1000:.0f} ms")
 
     seq_handler = SequenceHandler()
-    cross_and_turn = [
+    sequences = {'cross_and_turn': Timeline([
         SequenceStep(duration=3.0, axes_map={KbAxis.PITCH: 1.0, KbAxis.YAW: 0.0}), # Cross
         SequenceStep(duration=0.1, axes_map={KbButton.PAUSE: True}), # Wait
         SequenceStep(duration=8.0, axes_map={KbAxis.PITCH: 0.0, KbAxis.YAW: 1.0}), # Turn 180
-    ]
+    ], name='cross_and_turn')}
+    if args.sequences:
+        try:
+            sequences.update(load_sequences(args.sequences))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Invalid sequences file {args.sequences}: {e}")
+            k_emu.close()
+            return
+    if args.sequence not in sequences:
+        print(f"Unknown sequence '{args.sequence}', available: {', '.join(sequences)}")
+        k_emu.close()
+        return
+    mission = sequences[args.sequence]
+
+    # pygame has to stay on the main thread, serial ports reconnect in the background
+    connection = ConnectionManager(create_controller, background=all(DRIVERS[model].background_reconnect for model in models))
+
+    if args.replay:
+        # Recorded session instead of hardware
+        rc = ReplayController(args.replay, realtime=not args.replay_fast, curves=mappings.curves, **deadzones)
+    else:
+        with PROFILE.measure(f"connect {model_choice}"):
+            rc = connection.connect(retry_limit=15)
+        if rc is None:
+            print(f"Could not connect to {model_choice}.")
+            k_emu.close()
+            return
+        print(f"Successfully connected to {model_choice}!")
 
+    if args.calibrate:
+        # Measures this unit's stick range, later connections load it automatically
+        if hasattr(rc, 'read_raw'):
+            run_calibration(rc)
+        else:
+            print(f"{model_choice} reports calibrated values already, nothing to calibrate.")
 
-    last_camera = None
+    prepare_controller(rc)
+    if args.threaded and len(models) == 1:
+        if rc.supports_acquisition:
+            print("Background acquisition enabled.")
+        else:
+            print(f"{model_choice} does not support background acquisition, polling in the main loop.")
+    elif hasattr(rc, 'pipeline'):
+        print(f"Stick requests are sent once per frame (at most {args.rate}/s), --threaded lets them follow the controller.")
+
+    # Proportional mode: partial stick deflection becomes a key duty cycle
+    modulator = None
+    if args.pwm:
+        # min_pulse and per-axis curves come from the "pwm" section of --profiles
+        modulator = PwmModulator(k_emu, period=args.pwm, **mappings.pwm)
+        modulator.start()
+        print(f"Proportional key modulation enabled ({args.pwm * 1000:.0f} ms period, "
+              f"min pulse {modulator.min_pulse * 1000:.0f} ms).")
+
+    # Multi-button gestures, evaluated once per frame from the button bank.
+    # Bits follow the driver's `buttons` order: button1 is bit 0 ... button4 is bit 3.
+    gestures = GestureRecognizer()
+    FORWARD_CRUISE = gestures.add_hold_tap('forward_cruise', hold_mask=0b0001, tap_mask=0b1000)
+
+    last_mode = 0
+    override_step = None  # Sequence step the override slots were compiled from
+    override_slots, override_pause = (), False
 
     # State toggles
     hold_cruise = False  # Locks Pitch
@@ -57,115 +243,206 @@ def main(model_choice):
     frozen_roll = 0.0
     frozen_yaw = 0.0
 
+    # Everything printed from inside the loop goes through the off-thread log
+    event_log.configure(drop_policy=args.log_drop)
+
+    # Fixed-rate pacing. In precise mode the last 2 ms of each frame are spun.
+    scheduler = FrameScheduler(rate_hz=args.rate, spin_threshold=0.002 if args.precise else 0.0)
+
+    # Per-stage instrumentation, a no-op unless requested
+    metrics = NullMetrics()
+    if args.metrics or args.metrics_port:
+        metrics = Metrics(stages=('update', 'logic', 'keys'), counters=('update_failures',))
+        metrics.gauge('overruns', lambda: scheduler.overruns)
+        metrics.gauge('dropped_frames', lambda: scheduler.skipped)
+        metrics.gauge('key_events', lambda: k_emu.events_sent)
+        if k_emu.pacer:
+            metrics.gauge('key_events_merged', lambda: k_emu.pacer.merged)
+            metrics.gauge('key_events_deferred', lambda: k_emu.pacer.deferred)
+        if filters:
+            metrics.gauge('filter_suppressed', lambda: filters.suppressed)
+        if hasattr(rc, 'pipeline'):
+            metrics.gauge('sample_rate', lambda: round(rc.pipeline.rate))
+            metrics.gauge('lost_requests', lambda: rc.pipeline.lost)
+        if args.metrics_port:
+            metrics.serve(args.metrics_port)
+    next_report = time.monotonic() + args.metrics if args.metrics else None
+
     # 3. Universal loop
     try:
-        print("Streaming data. Press Ctrl+C to stop.")
+        print(f"Streaming data at {args.rate} Hz. Press Ctrl+C to stop.")
+        first_frame = True
+        scheduler.start()
         while True:
+            scheduler.wait()
+            metrics.begin()
+
+            if next_report and time.monotonic() >= next_report:
+                log("[METRICS] {}", metrics.summary())
+                next_report += args.metrics
+
+            # Release any tapped keys whose hold time is over
+            k_emu.service()
+
             if not rc.is_connected:
-                print("[!!!] CONTROLLER DISCONNECTED [!!!]")
-                break
+                if args.replay:
+                    log("[!!!] CONTROLLER DISCONNECTED [!!!]")
+                    break
+
+                if not connection.reconnecting:
+                    log("[!!!] CONTROLLER DISCONNECTED, reconnecting... [!!!]")
+                    # Every key stays released until the controller is back
+                    seq_handler.stop()
+                    if modulator: modulator.set_axes(())
+                    k_emu.cleanup()
+                    hold_cruise = False
+                    hold_turn = False
+                    recorder, rc.recorder = rc.recorder, None
+                    rc.close()
+                    connection.start_reconnect()
 
-            if not rc.update(): continue
+                new_rc = connection.poll()
+                if new_rc is None:
+                    continue
+                prepare_controller(new_rc, recorder)
+                rc = new_rc
+                log("[OK] Controller reconnected ({} so far)", connection.reconnects)
+
+            if not rc.update():
+                metrics.count('update_failures')
+                continue
+            metrics.lap('update')
+
+            if first_frame:
+                first_frame = False
+                PROFILE.mark("first frame")
+                if args.startup_profile:
+                    log("{}", PROFILE.report())
+
+            gestures.update(rc.buttons)
+
+            # Live stick values of the frame, filtered before any logic looks at them
+            values[SLOT_ROLL] = rc.roll
+            values[SLOT_PITCH] = rc.pitch
+            values[SLOT_THROTTLE] = rc.throttle
+            values[SLOT_YAW] = rc.yaw
+            values[SLOT_TILT] = rc.tilt
+            if filters:
+                filters.apply(values, time.monotonic())
 
             if rc.button1.is_short_tap:
-                print('>>> Emergency PAUSE for 3 sec <<<')
+                log('>>> Emergency PAUSE for 3 sec <<<')
                 seq_handler.stop()
+                if modulator: modulator.set_axes(())
                 k_emu.force_cleanup()
                 hold_cruise = False
                 hold_turn = False
                 time.sleep(3)
-                print('>>> Emergency PAUSE Finished <<<')
+                log('>>> Emergency PAUSE Finished <<<')
+                scheduler.start()
                 continue
 
             if rc.button3.is_long_press and not (hold_cruise or hold_turn):
                 if seq_running:
                     seq_handler.stop()
                 else:
-                    seq_handler.start_sequence(cross_and_turn)
+                    seq_handler.start_sequence(mission)
 
-            overrides, seq_running = seq_handler.update()
+            step, step_values, seq_running = seq_handler.update()
             
             if not seq_running:
                 # --- enable cruise ---
                 if rc.button4.is_short_tap:
                     if hold_cruise:
-                        print('>>> DISABLE CRUISE <<<')
+                        log('>>> DISABLE CRUISE <<<')
                         hold_cruise = False
                     else:
                         if hold_turn:
-                            print('>>> DISABLE TURN <<<')
+                            log('>>> DISABLE TURN <<<')
                             hold_turn = False
-                        elif rc.yaw != 0:
-                            print('>>> ENABLE TURN <<<')
-                            frozen_yaw = rc.yaw
+                        elif values[SLOT_YAW] != 0:
+                            log('>>> ENABLE TURN <<<')
+                            frozen_yaw = values[SLOT_YAW]
                             hold_turn = True
 
-                if rc.button1.is_maintained_long_press and rc.button4.is_short_tap:
-                    print('>>> ENABLE FORWARD CRUISE <<<')
+                if gestures.fired & FORWARD_CRUISE:
+                    log('>>> ENABLE FORWARD CRUISE <<<')
                     hold_cruise = True
                     frozen_pitch = 1
                     frozen_roll = 0
 
                 if rc.button4.is_long_press:
-                    if rc.pitch != 0 or rc.roll != 0:
-                        print('>>> ENABLE FREE CRUISE <<<')
+                    if values[SLOT_PITCH] != 0 or values[SLOT_ROLL] != 0:
+                        log('>>> ENABLE FREE CRUISE <<<')
                         hold_cruise = True
-                        frozen_pitch = rc.pitch
-                        frozen_roll = rc.roll
+                        frozen_pitch = values[SLOT_PITCH]
+                        frozen_roll = values[SLOT_ROLL]
                     else:
-                        print('>>> FREE CRUISE HAS NO VALUES TO CRUISE<<<')
+                        log('>>> FREE CRUISE HAS NO VALUES TO CRUISE<<<')
 
             
 
-            # --- Determine Final Axis Values ---
-            # If Cruise is on, use the frozen pitch, otherwise use real-time stick
-            pitch_val = frozen_pitch if hold_cruise else overrides.get(KbAxis.PITCH, rc.pitch)
-            
-            # Roll remains real-time unless you want to lock that too
-            roll_val = frozen_roll if hold_cruise else overrides.get(KbAxis.ROLL, rc.roll)
-            
-            # If Hold Turn is on, use the frozen yaw, otherwise use real-time stick
-            yaw_val = frozen_yaw if hold_turn else overrides.get(KbAxis.YAW, rc.yaw)
-
-            # --- 2. Handle Mode Switch (Camera modes) ---
-            if rc.sw1 != last_camera:
-                target = {1: KbButton.CAMERA_WIDE, 0: KbButton.CAMERA_ZOOM, -1: KbButton.CAMERA_IR}.get(rc.sw1)
-                if target: k_emu.tap(target)
-                last_camera = rc.sw1
-
-            if overrides.get(KbButton.PAUSE, False):
-                k_emu.tap(KbButton.PAUSE)
+            # --- Select the mapping profile (e.g. by sw2) ---
+            mode = switch_mode(rc.sw1, rc.sw2)
+            active = mappings.select(mode)
+            if active is not program:
+                if program is not None:
+                    log('>>> PROFILE: {} <<<', active.name)
+                program = active
+                override_step = step
+                override_slots, override_pause = program.compile_overrides(step)
 
-            # --- 3. Handle Buttons (One-shot Taps) ---
-            if rc.button2.is_short_tap:
-                k_emu.tap(KbButton.ANNOTATION)
+            # --- Determine Final Axis Values ---
+            # Sequence overrides are compiled to slots once per step, ramps only change the values
+            if step is not override_step:
+                override_step = step
+                override_slots, override_pause = program.compile_overrides(step)
+            for slot, i in override_slots:
+                values[slot] = step_values[i]
 
-            if rc.button3.is_short_tap:
-                k_emu.tap(KbButton.PICTURE)
+            # If Cruise is on, use the frozen pitch/roll, if Hold Turn is on, the frozen yaw
+            if hold_cruise:
+                values[SLOT_PITCH] = frozen_pitch
+                values[SLOT_ROLL] = frozen_roll
+            if hold_turn:
+                values[SLOT_YAW] = frozen_yaw
+            metrics.lap('logic')
 
-            # --- 4. Handle Keyboard Emulation ---
-            # We send the processed pitch_val and yaw_val (either live or frozen)
-            k_emu.handle_axis(KbAxis.PITCH, pitch_val)
-            k_emu.handle_axis(KbAxis.ROLL, roll_val)
-            k_emu.handle_axis(KbAxis.YAW, yaw_val)
+            # --- 2. One-shot taps: mode switches (camera modes) and buttons ---
+            program.fire_taps(k_emu, rc.buttons.taps, mode, last_mode)
+            last_mode = mode
 
-            # Extra Camera Yaw (Fast phase) if in Wide mode
-            if last_camera == 1:
-                k_emu.handle_axis(KbAxis.CAMERA_YAW, yaw_val)
+            if override_pause:
+                k_emu.tap(KbButton.PAUSE)
 
-            # Elevation (Throttle)
-            k_emu.handle_axis(KbAxis.THROTTLE, rc.throttle)
-
-            # Camera Tilt (Gimbal)
-            k_emu.handle_axis(KbAxis.CAMERA_PITCH, rc.tilt) 
-            
-            time.sleep(0.01) # ~100Hz update rate
+            # --- 3. Handle Keyboard Emulation ---
+            if modulator:
+                # The modulator thread turns the values into timed key pulses
+                modulator.set_axes(program.axis_values(values, mode))
+            else:
+                # The whole frame is collected into one key mask and diffed in a single batch
+                k_emu.apply_axes(program.key_mask(values, mode))
+            metrics.lap('keys')
 
     except KeyboardInterrupt:
         print("User interrupted. Closing connection...")
     finally:
+        connection.stop()
         rc.close()
+        if modulator: modulator.stop()
         k_emu.force_cleanup()
+        k_emu.close()
+        loop_log = event_log.get_log()
+        loop_log.close()
+        if loop_log.dropped:
+            print(f"Log records dropped: {loop_log.dropped}")
+        print(f"Loop stats: {scheduler.summary()}")
+        if filters:
+            print(f"Axis filter suppressed {filters.suppressed} key events ({filters.key_events} sent)")
+        if k_emu.pacer:
+            print(f"Key pacing: {k_emu.pacer.summary()} ({k_emu.events_sent} sent)")
+        if isinstance(metrics, Metrics):
+            print(f"[METRICS] {metrics.summary()}")
         print("Done.")
 
 if __name__ == "__main__":
@@ -176,11 +453,246 @@ if __name__ == "__main__":
         '--model', 
         type=str, 
         default='RC3', 
-        choices=['RC3', 'N1', 'M300'],
+        choices=available_models(),
         help='Remote controller model to use (default: RC3)'
     )
+
+    parser.add_argument(
+        '--models',
+        type=member_spec,
+        nargs='+',
+        default=None,
+        metavar='MODEL[:PORT]',
+        help=f'Use several controllers at once, highest priority first (overrides --model). '
+             f'Models: {", ".join(available_models())}. Serial ones take their own port, e.g. N1:/dev/ttyACM0'
+    )
+
+    parser.add_argument(
+        '--merge',
+        type=str,
+        default='priority',
+        choices=MERGE_POLICIES,
+        help='How --models are merged: priority takeover, per-axis owners or max magnitude (default: priority)'
+    )
+
+    parser.add_argument(
+        '--owner',
+        type=owner_spec,
+        action='append',
+        default=[],
+        metavar='INPUT=INDEX',
+        help='With --merge axes: controller (index into --models) owning an axis, "buttons" or "switches", '
+             'e.g. --owner tilt=1. Unlisted inputs belong to the first controller'
+    )
+
+    parser.add_argument(
+        '--port',
+        type=str,
+        default=None,
+        help='Serial port for N1/M300 (default: discovered, then the driver\'s port, e.g. COM4/COM5). '
+             'With --models give each controller its port as MODEL:PORT instead'
+    )
+
+    parser.add_argument(
+        '--pipeline',
+        type=int,
+        default=None,
+        metavar='DEPTH',
+        help='N1/M300 with --threaded: stick requests kept in flight, the request rate adapts to the replies '
+             '(default: 2). Without --threaded requests are only sent once per loop frame, at most --rate'
+    )
+
+    parser.add_argument(
+        '--calibrate',
+        action='store_true',
+        help='N1/M300: measure this unit\'s stick range before starting (stored per controller)'
+    )
+
+    parser.add_argument(
+        '--threaded',
+        action='store_true',
+        help='Read serial controllers (N1, M300) from a background thread'
+    )
+    
+    parser.add_argument(
+        '--rate',
+        type=int,
+        default=100,
+        choices=[100, 250, 500, 1000],
+        help='Control loop rate in Hz (default: 100)'
+    )
+
+    parser.add_argument(
+        '--precise',
+        action='store_true',
+        help='Busy-wait the end of each frame for sub-millisecond timing (uses more CPU)'
+    )
+    
+    parser.add_argument(
+        '--events',
+        action='store_true',
+        help='RC3 only: consume joystick events instead of polling every axis/button each frame'
+    )
+    
+    parser.add_argument(
+        '--pwm',
+        type=float,
+        default=None,
+        metavar='PERIOD',
+        help='Proportional key modulation with the given period in seconds (e.g. 0.1); '
+             'min_pulse and per-axis curves go in the "pwm" section of --profiles'
+    )
+    
+    parser.add_argument(
+        '--output',
+        type=str,
+        default='pynput',
+        choices=sorted(BACKENDS),
+        help='Key injection backend (default: pynput, uinput is Linux only and works headless)'
+    )
+    
+    parser.add_argument(
+        '--profiles',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='JSON file with the stick/button to key mapping profiles (default: built-in profile)'
+    )
+
+    parser.add_argument(
+        '--filter',
+        type=str,
+        default=None,
+        choices=sorted(FILTERS),
+        help='Hysteresis deadzone between decode and keys, optionally smoothed (ema/one_euro); '
+             'per-axis settings go in the "filters" section of --profiles'
+    )
+
+    parser.add_argument(
+        '--dwell',
+        type=float,
+        default=0.03,
+        metavar='SECONDS',
+        help='With --filter: minimum time an axis key stays pressed/released (default: 0.03)'
+    )
+
+    parser.add_argument(
+        '--min-press',
+        type=float,
+        default=0.0,
+        metavar='SECONDS',
+        help='Shortest time any key is held down, for targets that poll the keyboard slowly (e.g. 0.04)'
+    )
+
+    parser.add_argument(
+        '--min-release',
+        type=float,
+        default=0.0,
+        metavar='SECONDS',
+        help='Shortest time a released key stays up before it is pressed again'
+    )
+
+    parser.add_argument(
+        '--max-key-rate',
+        type=float,
+        default=None,
+        metavar='EVENTS',
+        help='Most key events per second sent to the target; changes superseded meanwhile are merged'
+    )
+
+    parser.add_argument(
+        '--sequences',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='JSON file with named sequences (timelines with ramps and loops)'
+    )
+
+    parser.add_argument(
+        '--sequence',
+        type=str,
+        default='cross_and_turn',
+        metavar='NAME',
+        help='Sequence started by a long press of button3 (default: cross_and_turn)'
+    )
+
+    parser.add_argument(
+        '--capture',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='Record every raw frame from the controller to a capture file'
+    )
+
+    parser.add_argument(
+        '--replay',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='Replay a capture file instead of connecting to hardware (--model is ignored)'
+    )
+
+    parser.add_argument(
+        '--replay-fast',
+        action='store_true',
+        help='Replay one frame per loop iteration instead of the original timing'
+    )
+    
+    parser.add_argument(
+        '--log-drop',
+        type=str,
+        default=event_log.DROP_NEW,
+        choices=[event_log.DROP_NEW, event_log.DROP_OLD],
+        help='What to discard when the console can\'t keep up with the log (default: drop_new)'
+    )
+
+    parser.add_argument(
+        '--startup-profile',
+        action='store_true',
+        help='Report import/init time per step up to the first frame'
+    )
+
+    parser.add_argument(
+        '--metrics',
+        type=float,
+        default=None,
+        metavar='SECONDS',
+        help='Print per-stage loop timings every SECONDS'
+    )
+
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        default=None,
+        metavar='PORT',
+        help='Serve OpenMetrics text on http://127.0.0.1:PORT/metrics'
+    )
     
     args = parser.parse_args()
+    if args.models:
+        if args.port:
+            parser.error("--port applies to --model, give each of --models its port as MODEL:PORT")
+        ports = [port for _, port in args.models if port]
+        if len(set(ports)) < len(ports):
+            parser.error("--models uses the same port twice")
+        models = [model for model, _ in args.models]
+        for model, port in args.models:
+            # Discovery can't tell two units of one model apart
+            if models.count(model) > 1 and not port:
+                parser.error(f"--models lists {model} more than once, give each one its port as {model}:PORT")
+    if args.owner:
+        if args.merge != 'axes':
+            parser.error("--owner only applies to --merge axes")
+        count = len(args.models or ())
+        for key, index in args.owner:
+            if index >= count:
+                parser.error(f"--owner {key}={index}: --models lists {count} controllers, indexes start at 0")
+    if args.pipeline is not None:
+        if args.pipeline < 1:
+            parser.error("--pipeline must be at least 1")
+        # Several --models always read their serial controllers on background threads
+        if not args.threaded and not (args.models and len(args.models) > 1):
+            parser.error("--pipeline needs --threaded, the main loop sends at most one request per frame")
     
-    # Pass the argument value into main
-    main(args.model)
+    # Pass the arguments into main
+    main(args)
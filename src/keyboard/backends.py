@@ -0,0 +1,169 @@
+import os
+import stat
+import struct
+import time
+from abc import ABC, abstractmethod
+
+class KeyboardBackend(ABC):
+    """
+    Where KeyboardEmulator sends its key events.
+    press()/release() may be buffered, flush() ends a batch (one emulator frame).
+    """
+    @abstractmethod
+    def press(self, key):
+        pass
+
+    @abstractmethod
+    def release(self, key):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class PynputBackend(KeyboardBackend):
+    """Default backend: pynput's Controller (XTest on Linux, SendInput on Windows)."""
+    def __init__(self):
+        from pynput.keyboard import Controller
+        self.controller = Controller()
+
+    def press(self, key):
+        self.controller.press(key)
+
+    def release(self, key):
+        self.controller.release(key)
+
+
+class RecordingBackend(KeyboardBackend):
+    """Null output that only records (timestamp, key, pressed). For benchmarks and tests."""
+    def __init__(self, clock=time.perf_counter_ns):
+        self.clock = clock
+        self.events = []
+        self.flushes = 0
+
+    def press(self, key):
+        self.events.append((self.clock(), key, True))
+
+    def release(self, key):
+        self.events.append((self.clock(), key, False))
+
+    def flush(self):
+        self.flushes += 1
+
+    def clear(self):
+        self.events.clear()
+        self.flushes = 0
+
+
+# --- Linux uinput ---
+EV_SYN = 0x00
+EV_KEY = 0x01
+SYN_REPORT = 0
+
+UI_SET_EVBIT  = 0x40045564
+UI_SET_KEYBIT = 0x40045565
+UI_DEV_SETUP  = 0x405C5503
+UI_DEV_CREATE = 0x5501
+UI_DEV_DESTROY = 0x5502
+BUS_USB = 0x03
+
+# struct input_event: struct timeval, __u16 type, __u16 code, __s32 value
+INPUT_EVENT = struct.Struct('llHHi')
+
+# Linux KEY_* codes for everything the emulator can send.
+# Special keys are looked up by their pynput Key name.
+UINPUT_KEYCODES = {
+    '1': 2, '2': 3, '3': 4, '4': 5, '5': 6, '6': 7, '7': 8, '8': 9, '9': 10, '0': 11,
+    'q': 16, 'w': 17, 'e': 18, 'r': 19, 't': 20, 'y': 21, 'u': 22, 'i': 23, 'o': 24, 'p': 25,
+    'a': 30, 's': 31, 'd': 32, 'f': 33, 'g': 34, 'h': 35, 'j': 36, 'k': 37, 'l': 38,
+    'z': 44, 'x': 45, 'c': 46, 'v': 47, 'b': 48, 'n': 49, 'm': 50,
+    'esc': 1, 'enter': 28, 'space': 57, 'tab': 15,
+    'up': 103, 'left': 105, 'right': 106, 'down': 108,
+}
+
+
+class UinputBackend(KeyboardBackend):
+    """
+    Injects keys through a Linux uinput virtual keyboard. Works without a display.
+
+    All key changes of a frame are buffered and written with a single write()
+    followed by one SYN_REPORT. If `device` is a regular file instead of the
+    uinput character device, the device setup is skipped and raw input_events
+    are appended to it, which is how this backend is tested.
+    """
+    def __init__(self, device='/dev/uinput', name='DJI RC Keyboard'):
+        if os.path.exists(device) and stat.S_ISCHR(os.stat(device).st_mode):
+            self._is_uinput = True
+            try:
+                self.fd = os.open(device, os.O_WRONLY | os.O_NONBLOCK)
+            except OSError as e:
+                raise OSError(f"Cannot open {device}: {e.strerror} (needs write access, e.g. a udev rule)") from e
+        elif device.startswith('/dev/'):
+            raise OSError(f"{device} is not available (is the uinput module loaded?)")
+        else:
+            self._is_uinput = False
+            self.fd = os.open(device, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._pending = bytearray()
+
+        if self._is_uinput:
+            try:
+                self._create_device(name)
+            except OSError:
+                os.close(self.fd)
+                self.fd = None
+                raise
+
+    def _create_device(self, name):
+        import fcntl
+        fcntl.ioctl(self.fd, UI_SET_EVBIT, EV_KEY)
+        for code in UINPUT_KEYCODES.values():
+            fcntl.ioctl(self.fd, UI_SET_KEYBIT, code)
+
+        # struct uinput_setup: input_id (bustype, vendor, product, version), name[80], ff_effects_max
+        setup = struct.pack('HHHH80sI', BUS_USB, 0x2CA3, 0x0001, 1, name.encode()[:79], 0)
+        fcntl.ioctl(self.fd, UI_DEV_SETUP, setup)
+        fcntl.ioctl(self.fd, UI_DEV_CREATE)
+        # Give udev/the compositor a moment to pick up the new device
+        time.sleep(0.1)
+
+    def _keycode(self, key):
+        name = getattr(key, 'name', key)
+        code = UINPUT_KEYCODES.get(name)
+        if code is None:
+            raise ValueError(f"No uinput keycode for {key!r}")
+        return code
+
+    def _queue(self, key, value):
+        self._pending += INPUT_EVENT.pack(0, 0, EV_KEY, self._keycode(key), value)
+
+    def press(self, key):
+        self._queue(key, 1)
+
+    def release(self, key):
+        self._queue(key, 0)
+
+    def flush(self):
+        if not self._pending:
+            return
+        self._pending += INPUT_EVENT.pack(0, 0, EV_SYN, SYN_REPORT, 0)
+        os.write(self.fd, self._pending)
+        self._pending.clear()
+
+    def close(self):
+        if self.fd is None:
+            return
+        self.flush()
+        if self._is_uinput:
+            import fcntl
+            fcntl.ioctl(self.fd, UI_DEV_DESTROY)
+        os.close(self.fd)
+        self.fd = None
+
+
+BACKENDS = {
+    'pynput': PynputBackend,
+    'uinput': UinputBackend,
+}
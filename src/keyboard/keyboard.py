@@ -1,6 +1,23 @@
-from pynput.keyboard import Controller, Key
+import heapq
+import itertools
+import threading
 from enum import Enum
-from time import sleep
+from time import perf_counter
+from .backends import PynputBackend
+from .pacing import KeyPacer
+from src.utils.event_log import log
+
+try:
+    from pynput.keyboard import Key
+except ImportError:
+    # pynput needs a display on Linux. Headless runs use the uinput backend,
+    # which only needs the names of the special keys.
+    class Key(Enum):
+        space = 'space'
+        up    = 'up'
+        down  = 'down'
+        left  = 'left'
+        right = 'right'
 
 class KbButton(Enum):
     CAMERA_WIDE   = '1'
@@ -18,70 +35,210 @@ class KbAxis(Enum):
     CAMERA_PITCH  = (Key.down, Key.up)
     CAMERA_YAW    = (Key.right, Key.left)
 
+DEFAULT_TAP_HOLD = 0.08
+
 class KeyboardEmulator:
-    def __init__(self, emulate_hardware=True, print_events=True):
-        self.keyboard = Controller()
+    """
+    min_press/min_release/max_rate: optional KeyPacer between the key logic and
+    the backend, for targets that miss keys changing on consecutive frames.
+    """
+    def __init__(self, emulate_hardware=True, print_events=True, tap_hold_times=None, backend=None,
+                 min_press=0.0, min_release=0.0, max_rate=None):
         self.emulate_hardware = emulate_hardware
+        self.backend = None
+        if emulate_hardware:
+            self.backend = backend if backend is not None else PynputBackend()
         self.print_events = print_events
+
+        # --- Pending tap releases ---
+        # Heap of (release_time, seq, key). _tap_deadlines holds the live deadline per
+        # key, heap entries that no longer match it are stale and get skipped.
+        self.tap_hold_times = {button: DEFAULT_TAP_HOLD for button in KbButton}
+        if tap_hold_times:
+            self.tap_hold_times.update(tap_hold_times)
+        self._tap_heap = []
+        self._tap_deadlines = {}
+        self._tap_holds = {}
+        self._tap_seq = itertools.count()  # Tie-breaker, keys themselves don't compare
         
-        # 1. Automatically generate active_keys from the Axis Enum
+        # 1. Automatically assign one bit per key from the Enums
         # We also add the static keys for one-shot buttons
-        # self.active_keys = {'1': False, '2': False, '3': False, 'f': False, 't': False}
-        self.active_keys = {}
+        self.keys = []      # bit index -> key
+        self.key_bits = {}  # key -> bit mask
 
         for button in KbButton:
-            key = button.value
-            self.active_keys[key] = False
-            
+            self._register_key(button.value)
+
+        # axis -> (positive key bit, negative key bit)
+        self.axis_bits = {}
+        self.axes_mask = 0  # Every bit owned by an axis
         for axis in KbAxis:
             pos_key, neg_key = axis.value
-            self.active_keys[pos_key] = False
-            self.active_keys[neg_key] = False
+            pos_bit = self._register_key(pos_key)
+            neg_bit = self._register_key(neg_key)
+            self.axis_bits[axis] = (pos_bit, neg_bit)
+            self.axes_mask |= pos_bit | neg_bit
+
+        # Currently pressed keys, one bit per entry in self.keys
+        self.pressed_mask = 0
+        self.events_sent = 0
+        # Keys can be driven from a second thread (e.g. PwmModulator)
+        self._lock = threading.Lock()
+
+        self.pacer = None
+        if min_press or min_release or max_rate:
+            self.pacer = KeyPacer(len(self.keys), min_press=min_press, min_release=min_release, max_rate=max_rate)
+
+    def _register_key(self, key):
+        if key not in self.key_bits:
+            self.key_bits[key] = 1 << len(self.keys)
+            self.keys.append(key)
+        return self.key_bits[key]
+
+    @property
+    def active_keys(self):
+        """Key -> pressed state, for debugging."""
+        return {key: bool(self.pressed_mask & self.key_bits[key]) for key in self.keys}
 
     def _press(self, key):
-        if self.print_events: print(f'[PRESS]: {key}')
-        if self.emulate_hardware: self.keyboard.press(key)
+        self.events_sent += 1
+        if self.print_events: log('[PRESS]: {}', key)
+        if self.emulate_hardware: self.backend.press(key)
 
     def _release(self, key):
-        if self.print_events: print(f'[RELEASE]: {key}')
-        if self.emulate_hardware: self.keyboard.release(key)
+        self.events_sent += 1
+        if self.print_events: log('[RELEASE]: {}', key)
+        if self.emulate_hardware: self.backend.release(key)
+
+    def _emit(self, changed):
+        """Toggles the keys in `changed` on the backend. Caller holds the lock."""
+        if not changed:
+            return
+        keys = self.keys
+        pressed = self.pressed_mask
+        pending = changed
+        while pending:
+            low = pending & -pending
+            key = keys[low.bit_length() - 1]
+            if pressed & low:
+                self._release(key)
+            else:
+                self._press(key)
+            pending ^= low
+        self.pressed_mask ^= changed
+        if self.emulate_hardware: self.backend.flush()
+
+    def apply_mask(self, desired_mask, managed_mask=-1):
+        """
+        Moves the keys in managed_mask to the state given by desired_mask,
+        emitting only the presses/releases of keys that actually changed.
+        With a pacer, changes it holds back are sent later by service().
+        """
+        pacer = self.pacer
+        if not (self.pressed_mask ^ desired_mask) & managed_mask and (pacer is None or not pacer.pending):
+            return
+
+        with self._lock:
+            if pacer is None:
+                self._emit((self.pressed_mask ^ desired_mask) & managed_mask)
+            else:
+                pacer.want(self.pressed_mask, desired_mask, managed_mask)
+                self._emit(pacer.allowed(self.pressed_mask, perf_counter()))
 
     def set_key_state(self, key, should_be_pressed):
-        is_currently_pressed = self.active_keys.get(key, False)
-        if should_be_pressed and not is_currently_pressed:
-            self._press(key)
-            self.active_keys[key] = True
-        elif not should_be_pressed and is_currently_pressed:
-            self._release(key)
-            self.active_keys[key] = False
+        bit = self.key_bits.get(key)
+        if bit is None:
+            return
+        self.apply_mask(bit if should_be_pressed else 0, bit)
+
+    def axis_mask(self, axis_enum: KbAxis, axis_value):
+        """Bit of the key an axis value should hold down (0 when centered)."""
+        pos_bit, neg_bit = self.axis_bits[axis_enum]
+        if axis_value > 0:
+            return pos_bit
+        if axis_value < 0:
+            return neg_bit
+        return 0
+
+    def apply_axes(self, desired_mask):
+        """
+        Applies a whole frame of axis keys at once, e.g. built by OR-ing axis_mask() results.
+        Axis keys not set in desired_mask are released.
+        """
+        self.apply_mask(desired_mask, self.axes_mask)
 
     # 2. Simplified handle_axis using the Enum
     def handle_axis(self, axis_enum: KbAxis, axis_value):
         """Maps a float value to the keys defined in the Axis Enum."""
-        key_pos, key_neg = axis_enum.value
-        
-        if axis_value > 0:
-            self.set_key_state(key_pos, True)
-            self.set_key_state(key_neg, False)
-        elif axis_value < 0:
-            self.set_key_state(key_neg, True)
-            self.set_key_state(key_pos, False)
-        else:
-            self.set_key_state(key_pos, False)
-            self.set_key_state(key_neg, False)
+        pos_bit, neg_bit = self.axis_bits[axis_enum]
+        self.apply_mask(self.axis_mask(axis_enum, axis_value), pos_bit | neg_bit)
 
-    def tap(self, button_enum: KbButton, delay=0.08):
-        """One-shot tap using KbButton Enum."""
+    def tap(self, button_enum: KbButton, delay=None):
+        """
+        One-shot tap using KbButton Enum.
+        Returns immediately, the release is sent by service() once the hold time is over.
+        """
         key = button_enum.value
-        self._press(key)
-        sleep(delay)
-        self._release(key)
+        hold = self.tap_hold_times[button_enum] if delay is None else delay
+        release_at = perf_counter() + hold
+
+        self._tap_holds[key] = hold
+        if key in self._tap_deadlines:
+            # Tapped again while still held: just keep it down longer
+            self._tap_deadlines[key] = max(self._tap_deadlines[key], release_at)
+        else:
+            self.set_key_state(key, True)
+            self._tap_deadlines[key] = release_at
+        heapq.heappush(self._tap_heap, (self._tap_deadlines[key], next(self._tap_seq), key))
+
+    def service(self, now=None):
+        """
+        Releases every tapped key whose hold time is over and sends the changes
+        the pacer held back. Call once per frame.
+        """
+        pacer = self.pacer
+        heap = self._tap_heap
+        if not heap and (pacer is None or not pacer.pending):
+            return
+        if now is None:
+            now = perf_counter()
+
+        deferred = []
+        while heap and heap[0][0] <= now:
+            release_at, _, key = heapq.heappop(heap)
+            if self._tap_deadlines.get(key) != release_at:
+                continue
+            if pacer is not None:
+                # The hold counts from the press the pacer actually sent, which may be later than the tap
+                bit = self.key_bits[key]
+                sent_at = pacer.changed_at[bit.bit_length() - 1] if self.pressed_mask & bit else now
+                if sent_at + self._tap_holds[key] > now:
+                    self._tap_deadlines[key] = sent_at + self._tap_holds[key]
+                    deferred.append((self._tap_deadlines[key], next(self._tap_seq), key))
+                    continue
+            del self._tap_deadlines[key]
+            self.set_key_state(key, False)
+        for entry in deferred:
+            heapq.heappush(heap, entry)
+
+        if pacer is not None and pacer.pending:
+            with self._lock:
+                self._emit(pacer.allowed(self.pressed_mask, now))
+
+    def _clear_taps(self):
+        self._tap_heap.clear()
+        self._tap_deadlines.clear()
+        self._tap_holds.clear()
 
     def cleanup(self):
-        for key, is_pressed in list(self.active_keys.items()):
-            if is_pressed:
-                self._release(key)
-                self.active_keys[key] = False
+        self._clear_taps()
+        if self.pacer is None:
+            self.apply_mask(0)
+            return
+        # Releases everything right away: a stuck key is worse than a short press
+        with self._lock:
+            self._emit(self.pressed_mask)
+            self.pacer.reset(0)
 
     def force_cleanup(self):
         """
@@ -89,19 +246,30 @@ class KeyboardEmulator:
         regardless of whether the script thinks they are pressed.
         """
         if self.print_events:
-            print("[EMERGENCY] Force releasing all mapped keys...")
+            log("[EMERGENCY] Force releasing all mapped keys...")
             
-        self.keyboard.tap(KbButton.PAUSE.value)
-        for key in self.active_keys.keys():
-            # We call the internal _release directly to bypass state checks
-            try:
-                self.keyboard.release(key)
-                self.active_keys[key] = False
-            except Exception as e:
-                # Silently fail if a specific key wasn't actually 'down' in the OS
-                pass
+        self._clear_taps()
+        self.pressed_mask = 0
+        if self.pacer is not None:
+            self.pacer.reset(0)
+
+        if self.emulate_hardware:
+            self.backend.press(KbButton.PAUSE.value)
+            self.backend.release(KbButton.PAUSE.value)
+            for key in self.keys:
+                # We call the backend directly to bypass state checks
+                try:
+                    self.backend.release(key)
+                except Exception as e:
+                    # Silently fail if a specific key wasn't actually 'down' in the OS
+                    pass
+            self.backend.flush()
         
         if self.print_events:
-            print("[CLEANUP] Keyboard reset complete.")
+            log("[CLEANUP] Keyboard reset complete.")
+
+    def close(self):
+        if self.backend:
+            self.backend.close()
 
 
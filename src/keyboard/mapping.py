@@ -0,0 +1,232 @@
+import json
+from .keyboard import KbAxis, KbButton
+
+# Source slots of the per-frame value list, same order as SAMPLE_AXES
+SOURCES = ('roll', 'pitch', 'throttle', 'yaw', 'tilt')
+SLOT_ROLL, SLOT_PITCH, SLOT_THROTTLE, SLOT_YAW, SLOT_TILT = range(len(SOURCES))
+
+# Switch positions are packed into one int per frame: 3 bits per switch, one per position
+SWITCHES = ('sw1', 'sw2')
+ALL_POSITIONS = (1 << 3 * len(SWITCHES)) - 1
+
+# Bits of the ButtonBank, in the drivers' `buttons` order
+BUTTONS = ('button1', 'button2', 'button3', 'button4')
+
+# The policy main.py used to hard-code
+BUILTIN_PROFILES = {
+    'default': 'default',
+    'profiles': {
+        'default': {
+            'axes': [
+                {'source': 'pitch', 'axis': 'PITCH'},
+                {'source': 'roll', 'axis': 'ROLL'},
+                {'source': 'yaw', 'axis': 'YAW'},
+                {'source': 'yaw', 'axis': 'CAMERA_YAW', 'when': {'sw1': [1]}},  # Fast pan in wide mode
+                {'source': 'throttle', 'axis': 'THROTTLE'},
+                {'source': 'tilt', 'axis': 'CAMERA_PITCH'},
+            ],
+            'switches': {'sw1': {'1': 'CAMERA_WIDE', '0': 'CAMERA_ZOOM', '-1': 'CAMERA_IR'}},
+            'buttons': {'button2': 'ANNOTATION', 'button3': 'PICTURE'},
+        },
+    },
+}
+
+
+def switch_mode(sw1, sw2):
+    """Packs the switch positions (-1/0/1) into the mode int the programs test against."""
+    return 1 << (sw1 + 1) | 1 << (sw2 + 4)
+
+
+def _lookup(enum, name, what):
+    try:
+        return enum[name]
+    except KeyError:
+        raise ValueError(f"Unknown {what} '{name}', expected one of {[e.name for e in enum]}") from None
+
+
+def _index(names, name, what):
+    if name not in names:
+        raise ValueError(f"Unknown {what} '{name}', expected one of {list(names)}")
+    return names.index(name)
+
+
+def _positive(value, what):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError(f"{what} must be a positive number, got {value!r}")
+    return float(value)
+
+
+def _exponents(section, names, what):
+    """{name: exponent} of a response curve section, names checked against `names`."""
+    exponents = {}
+    for name, exponent in section.items():
+        _index(names, name, what)
+        exponents[name] = _positive(exponent, f"Curve exponent of '{name}'")
+    return exponents
+
+
+def _when_mask(when):
+    """{'sw1': [1], 'sw2': [0, 1]} -> position mask, switches not named accept every position."""
+    mask = ALL_POSITIONS
+    for switch, positions in (when or {}).items():
+        shift = 3 * _index(SWITCHES, switch, 'switch')
+        allowed = 0
+        for position in positions:
+            if position not in (-1, 0, 1):
+                raise ValueError(f"Switch position must be -1, 0 or 1, got {position}")
+            allowed |= 1 << (shift + position + 1)
+        mask = mask & ~(0b111 << shift) | allowed
+    return mask
+
+
+class MappingProgram:
+    """
+    One profile compiled against a KeyboardEmulator.
+
+    Every rule is a flat tuple of ints (and the enum member only where the
+    emulator needs it), so a frame is a few loops over tuples: no dict
+    lookups, no enum hashing, no allocation besides the modulator pairs.
+    """
+    def __init__(self, name, profile, emulator):
+        self.name = name
+
+        # (source slot, positive key bit, negative key bit, position mask, KbAxis)
+        rules = []
+        self.override_slots = {}  # KbAxis -> source slot, only used when a sequence step starts
+        for rule in profile.get('axes', ()):
+            slot = _index(SOURCES, rule['source'], 'source')
+            axis = _lookup(KbAxis, rule['axis'], 'axis')
+            pos_bit, neg_bit = emulator.axis_bits[axis]
+            rules.append((slot, pos_bit, neg_bit, _when_mask(rule.get('when')), axis))
+            self.override_slots.setdefault(axis, slot)
+        self.axis_rules = tuple(rules)
+
+        # (shift of the switch in the mode int, KbButton per position -1/0/1 or None)
+        switch_rules = []
+        for switch, targets in profile.get('switches', {}).items():
+            shift = 3 * _index(SWITCHES, switch, 'switch')
+            table = [None, None, None]
+            for position, button in targets.items():
+                table[int(position) + 1] = _lookup(KbButton, button, 'button')
+            switch_rules.append((shift, tuple(table)))
+        self.switch_rules = tuple(switch_rules)
+
+        # (ButtonBank bit, KbButton) tapped on a short tap
+        self.button_rules = tuple(
+            (1 << _index(BUTTONS, button, 'controller button'), _lookup(KbButton, target, 'button'))
+            for button, target in profile.get('buttons', {}).items())
+
+    def key_mask(self, values, mode):
+        """Axis keys to hold for this frame's source values."""
+        mask = 0
+        for slot, pos_bit, neg_bit, when, _ in self.axis_rules:
+            if when & mode != mode:
+                continue
+            value = values[slot]
+            if value > 0:
+                mask |= pos_bit
+            elif value < 0:
+                mask |= neg_bit
+        return mask
+
+    def axis_values(self, values, mode):
+        """(KbAxis, value) pairs for PwmModulator.set_axes()."""
+        return tuple((axis, values[slot]) for slot, _, _, when, axis in self.axis_rules if when & mode == mode)
+
+    def fire_taps(self, emulator, button_taps, mode, previous_mode):
+        """Taps the keys of the buttons tapped this frame and of the switches that moved."""
+        if button_taps:
+            for bit, button in self.button_rules:
+                if button_taps & bit:
+                    emulator.tap(button)
+
+        changed = mode ^ previous_mode
+        if changed:
+            for shift, table in self.switch_rules:
+                group = mode >> shift & 0b111
+                if changed >> shift & 0b111 and group:
+                    target = table[group.bit_length() - 1]
+                    if target is not None:
+                        emulator.tap(target)
+
+    def compile_overrides(self, step):
+        """
+        Maps a sequence step (CompiledStep) to ((value slot, index in the step's values), ...)
+        and its PAUSE flag. Called once per step, not per frame.
+        """
+        if step is None:
+            return (), False
+        slots = tuple((self.override_slots[key], i) for i, key in enumerate(step.keys)
+                      if key in self.override_slots)
+        pause = any(key is KbButton.PAUSE and value for key, value in zip(step.keys, step.end_values))
+        return slots, pause
+
+
+class MappingSet:
+    """
+    Every profile of a file, compiled once. select(mode) picks the active
+    program from a switch position with a tuple index, so switching profiles
+    at runtime never rebuilds anything.
+    """
+    def __init__(self, config, emulator):
+        profiles = config.get('profiles', {})
+        if not profiles:
+            raise ValueError("Mapping file defines no profiles")
+        self.programs = {name: MappingProgram(name, profile, emulator) for name, profile in profiles.items()}
+
+        default = config.get('default', next(iter(profiles)))
+        if default not in self.programs:
+            raise ValueError(f"Default profile '{default}' is not defined")
+        self.default = self.programs[default]
+
+        # Per-axis AxisFilter options, see src/utils/filters.py:build_filters
+        self.filters = config.get('filters', {})
+
+        # Response curve per source axis, e.g. {"yaw": 1.5}: |v| ** exponent,
+        # folded into the serial drivers' lookup tables (1.0 is linear)
+        self.curves = _exponents(config.get('curves', {}), SOURCES, 'curve axis')
+
+        # Proportional mode (--pwm), e.g. {"min_pulse": 0.02, "curves": {"PITCH": 2.0}}:
+        # PwmModulator options, curves per key axis. Empty when the file doesn't set them.
+        pwm = dict(config.get('pwm') or {})
+        unknown = set(pwm) - {'min_pulse', 'curves'}
+        if unknown:
+            raise ValueError(f"Unknown pwm settings {sorted(unknown)}, expected min_pulse and curves")
+        self.pwm = {}
+        if 'min_pulse' in pwm:
+            self.pwm['min_pulse'] = _positive(pwm['min_pulse'], "pwm min_pulse")
+        if pwm.get('curves'):
+            curves = _exponents(pwm['curves'], [axis.name for axis in KbAxis], 'pwm curve axis')
+            self.pwm['curves'] = {KbAxis[name]: exponent for name, exponent in curves.items()}
+
+        # How long each tapped key stays down, e.g. {"PICTURE": 0.15} for a slow target
+        self.tap_holds = {_lookup(KbButton, name, 'tap button'): _positive(seconds, f"Tap hold of '{name}'")
+                          for name, seconds in (config.get('taps') or {}).items()}
+
+        # Optional runtime selection, e.g. {"switch": "sw2", "positions": {"1": "camera"}}
+        select = config.get('select')
+        self._select_shift = None
+        self._by_position = (self.default,) * 3
+        if select:
+            self._select_shift = 3 * _index(SWITCHES, select['switch'], 'switch')
+            by_position = [self.default] * 3
+            for position, name in select.get('positions', {}).items():
+                if name not in self.programs:
+                    raise ValueError(f"Profile '{name}' selected by {select['switch']} is not defined")
+                by_position[int(position) + 1] = self.programs[name]
+            self._by_position = tuple(by_position)
+
+    def select(self, mode):
+        if self._select_shift is None:
+            return self.default
+        group = mode >> self._select_shift & 0b111
+        return self._by_position[group.bit_length() - 1] if group else self.default
+
+
+def load_mappings(emulator, path=None):
+    """Compiles the profiles of a JSON file, or the built-in ones when path is None."""
+    config = BUILTIN_PROFILES
+    if path is not None:
+        with open(path) as f:
+            config = json.load(f)
+    return MappingSet(config, emulator)
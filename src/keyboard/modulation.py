@@ -0,0 +1,122 @@
+import threading
+import time
+from .keyboard import KbAxis
+
+class PwmModulator:
+    """
+    Proportional control for on/off keys.
+
+    An axis value of 0.4 holds its key for 40% of every period instead of
+    holding it permanently. Edges are timed by a dedicated thread that sleeps
+    until the next edge and spins the last spin_threshold seconds, so the duty
+    cycle does not depend on the rate of the main loop.
+
+    curves: dict KbAxis -> exponent applied to |value| (1.0 is linear, 2.0
+            gives finer control near the center).
+    """
+    def __init__(self, emulator, period=0.1, min_pulse=0.015, curves=None, spin_threshold=0.001):
+        self.emulator = emulator
+        self.period = period
+        self.min_pulse = min_pulse
+        self.spin_threshold = spin_threshold
+        self.curves = {axis: 1.0 for axis in KbAxis}
+        if curves:
+            self.curves.update(curves)
+
+        # Stagger the axes inside the period so their edges don't all land together
+        self._phase_offsets = {axis: i * period / len(KbAxis) for i, axis in enumerate(KbAxis)}
+        self._origin = time.perf_counter()
+
+        # Targets are swapped as a whole tuple, the timer thread never sees a half update
+        self._targets = ()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def set_axes(self, axis_values):
+        """axis_values: sequence of (KbAxis, value) pairs for this frame."""
+        axis_values = tuple(axis_values)
+        if axis_values != self._targets:
+            self._targets = axis_values
+            self._wake.set()
+
+    def duty(self, axis, value):
+        """Fraction of the period the key is held, after the curve and minimum pulse width."""
+        mag = min(abs(value), 1.0) ** self.curves[axis]
+        on_time = mag * self.period
+        if on_time <= 0:
+            return 0.0
+        # Pulses shorter than min_pulse get lost by the target, round them up.
+        # Gaps shorter than min_pulse as well, so round those to fully held.
+        if on_time < self.min_pulse:
+            on_time = self.min_pulse
+        if self.period - on_time < self.min_pulse:
+            return 1.0
+        return on_time / self.period
+
+    def mask_at(self, now):
+        """
+        Returns: (key mask to hold at `now`, time of the next edge or None)
+        """
+        mask = 0
+        next_edge = None
+        axis_mask = self.emulator.axis_mask
+        period = self.period
+
+        for axis, value in self._targets:
+            duty = self.duty(axis, value)
+            if duty <= 0.0:
+                continue
+            if duty >= 1.0:
+                mask |= axis_mask(axis, value)
+                continue
+
+            on_time = duty * period
+            phase = (now - self._origin + self._phase_offsets[axis]) % period
+            if phase < on_time:
+                mask |= axis_mask(axis, value)
+                edge = now + (on_time - phase)
+            else:
+                edge = now + (period - phase)
+            if next_edge is None or edge < next_edge:
+                next_edge = edge
+
+        return mask, next_edge
+
+    # --- Timer thread ---
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="PwmModulator", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the timer and releases every axis key it was holding."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        self._targets = ()
+        self.emulator.apply_axes(0)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            now = time.perf_counter()
+            mask, next_edge = self.mask_at(now)
+            self.emulator.apply_axes(mask)
+
+            if next_edge is None:
+                # Nothing is modulating, sleep until the targets change
+                self._wake.wait(self.period)
+                continue
+
+            # Coarse wait that a new target can interrupt, then spin to the edge
+            timeout = next_edge - time.perf_counter() - self.spin_threshold
+            if timeout > 0 and self._wake.wait(timeout):
+                continue
+            while time.perf_counter() < next_edge:
+                pass
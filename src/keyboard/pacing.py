@@ -0,0 +1,102 @@
+def _count(mask):
+    return bin(mask).count('1')
+
+
+def _lowest(mask, n):
+    """The n lowest set bits of mask."""
+    taken = 0
+    while mask and n > 0:
+        low = mask & -mask
+        taken |= low
+        mask ^= low
+        n -= 1
+    return taken
+
+
+class KeyPacer:
+    """
+    Output scheduling between the mapping logic and the keyboard backend, for
+    target applications that poll the keyboard slower than the control loop.
+
+    min_press:   seconds a key stays down before it may be released
+    min_release: seconds a key stays up before it may be pressed again
+    max_rate:    key events per second overall, in bursts of up to `burst` events
+
+    The emulator only reports the state it wants every key in. Transitions that
+    are not allowed yet stay pending and only the latest wanted state is kept:
+    a press and release that cancel out before they were due are merged away
+    instead of being queued. When the event budget is short, releases go first
+    so a limited rate never leaves a key stuck down longer than asked for.
+    """
+    def __init__(self, key_count, min_press=0.0, min_release=0.0, max_rate=None, burst=None):
+        self.min_press = min_press
+        self.min_release = min_release
+        self.max_rate = max_rate
+        self.burst = burst if burst is not None else max(1, round((max_rate or 0) * 0.05))
+        self.key_count = key_count
+        self.merged = 0    # Events never sent because a later state superseded them
+        self.deferred = 0  # Transitions sent later than asked, by a dwell time or the budget
+        self.reset()
+
+    def reset(self, pressed=0):
+        """Forgets pending transitions and dwell history, e.g. after every key was force-released."""
+        self.wanted = pressed
+        self.changed_at = [float('-inf')] * self.key_count
+        self.tokens = float(self.burst)
+        self._refilled_at = None
+        self._waiting = 0
+
+    @property
+    def pending(self):
+        return self._waiting
+
+    def want(self, pressed, desired, managed):
+        """Records the desired state of the keys in `managed`."""
+        wanted = self.wanted & ~managed | desired & managed
+        cancelled = (self.wanted ^ pressed) & ~(wanted ^ pressed)
+        if cancelled:
+            # The pending transition and the one that undid it
+            self.merged += 2 * _count(cancelled)
+        self.wanted = wanted
+
+    def allowed(self, pressed, now):
+        """Bits of the pending keys that may change at `now`; their transitions are booked as sent."""
+        pending = self.wanted ^ pressed
+        if not pending:
+            self._waiting = 0
+            return 0
+
+        changed_at = self.changed_at
+        min_press, min_release = self.min_press, self.min_release
+        ready = 0
+        mask = pending
+        while mask:
+            low = mask & -mask
+            i = low.bit_length() - 1
+            if now - changed_at[i] >= (min_press if pressed & low else min_release):
+                ready |= low
+            mask ^= low
+
+        if ready and self.max_rate:
+            if self._refilled_at is not None:
+                self.tokens = min(self.burst, self.tokens + (now - self._refilled_at) * self.max_rate)
+            self._refilled_at = now
+            budget = int(self.tokens)
+            if _count(ready) > budget:
+                releases = _lowest(ready & pressed, budget)
+                ready = releases | _lowest(ready & ~pressed, budget - _count(releases))
+            self.tokens -= _count(ready)
+
+        waiting = pending & ~ready
+        self.deferred += _count(waiting & ~self._waiting)
+        self._waiting = waiting
+
+        mask = ready
+        while mask:
+            low = mask & -mask
+            changed_at[low.bit_length() - 1] = now
+            mask ^= low
+        return ready
+
+    def summary(self):
+        return f"merged {self.merged} | deferred {self.deferred}"
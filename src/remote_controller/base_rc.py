@@ -1,5 +1,10 @@
+import threading
 from abc import ABC, abstractmethod
-from src.utils.input_logic import ButtonHandler
+from src.utils.input_logic import ButtonBank
+from src.utils.capture import CaptureWriter
+
+# Order of the axis values in a decoded sample tuple
+SAMPLE_AXES = ('roll', 'pitch', 'throttle', 'yaw', 'tilt')
 
 class BaseRemoteController(ABC):
     """
@@ -24,10 +29,27 @@ class BaseRemoteController(ABC):
         self.sw2 = 0
 
         # --- Digital Buttons ---
-        self.button1 = ButtonHandler(buttons[0][0], print_update=buttons[0][1])
-        self.button2 = ButtonHandler(buttons[1][0], print_update=buttons[1][1])
-        self.button3 = ButtonHandler(buttons[2][0], print_update=buttons[2][1])
-        self.button4 = ButtonHandler(buttons[3][0], print_update=buttons[3][1])
+        # One bank for all buttons, drivers call self.buttons.update(mask) once per frame.
+        # Bit i is buttons[i]; button1..button4 are per-button views of it.
+        print_mask = sum(1 << i for i, (_, print_update) in enumerate(buttons) if print_update)
+        self.buttons = ButtonBank([name for name, _ in buttons], print_mask=print_mask)
+        self.button1 = self.buttons.view(0)
+        self.button2 = self.buttons.view(1)
+        self.button3 = self.buttons.view(2)
+        self.button4 = self.buttons.view(3)
+
+        # --- Background Acquisition (optional) ---
+        # The reader thread publishes (count, sample) here. Replacing a
+        # reference is atomic, so the control loop reads it without a lock.
+        self._latest_sample = None
+        self._consumed_count = 0
+        self._acq_thread = None
+        self._acq_stop = threading.Event()
+        self.acq_error = None
+
+        # --- Raw Frame Capture (optional) ---
+        self.recorder = None
+        self.calibration_key = None  # Stored calibration of this unit, if the driver has one
 
     @abstractmethod
     def update(self) -> bool:
@@ -52,6 +74,84 @@ class BaseRemoteController(ABC):
         """Returns True if the physical hardware is still reachable."""
         pass
     
+    # --- Background Acquisition ---
+    # Drivers whose I/O can be done off the control thread override
+    # read_sample() and set supports_acquisition = True.
+    supports_acquisition = False
+
+    def read_sample(self):
+        """
+        Polls the hardware once without blocking.
+        Returns: a tuple of axis values in SAMPLE_AXES order, or None if no new data.
+        Raises on I/O errors.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support background acquisition")
+
+    def apply_sample(self, sample):
+        self.roll, self.pitch, self.throttle, self.yaw, self.tilt = sample
+
+    @property
+    def acquiring(self) -> bool:
+        return self._acq_thread is not None
+
+    def start_acquisition(self, interval=0.002):
+        """Moves hardware polling to a dedicated reader thread."""
+        if not self.supports_acquisition:
+            raise NotImplementedError(f"{type(self).__name__} does not support background acquisition")
+        if self._acq_thread is not None:
+            return
+
+        self._acq_stop.clear()
+        self.acq_error = None
+        self._acq_thread = threading.Thread(
+            target=self._acquisition_loop, args=(interval,),
+            name=f"{type(self).__name__}-reader", daemon=True)
+        self._acq_thread.start()
+
+    def stop_acquisition(self):
+        if self._acq_thread is None:
+            return
+        self._acq_stop.set()
+        self._acq_thread.join(timeout=1.0)
+        self._acq_thread = None
+
+    def _acquisition_loop(self, interval):
+        count = 0
+        while not self._acq_stop.is_set():
+            try:
+                sample = self.read_sample()
+            except Exception as e:
+                # Leave the last good sample in place, update() reports the failure
+                self.acq_error = e
+                return
+            if sample is not None:
+                count += 1
+                self._latest_sample = (count, sample)
+            self._acq_stop.wait(interval)
+
+    def _update_from_acquisition(self) -> bool:
+        """Non-blocking update(): applies the newest sample published by the reader thread."""
+        if self.acq_error is not None:
+            return False
+        latest = self._latest_sample
+        if latest is not None and latest[0] != self._consumed_count:
+            self._consumed_count = latest[0]
+            self.apply_sample(latest[1])
+        return True
+
+    # --- Raw Frame Capture ---
+    def start_capture(self, path):
+        """Records every raw frame the driver receives, see src/utils/capture.py."""
+        self.stop_capture()
+        self.recorder = CaptureWriter(path, type(self).__name__, self.calibration_key)
+        print(f"Capturing raw frames to {path}")
+
+    def stop_capture(self):
+        if self.recorder is not None:
+            recorder, self.recorder = self.recorder, None
+            recorder.close()
+            print(f"Capture closed: {recorder.records} frames in {recorder.path}")
+
     def dead_zone_movement(self, value):
         return self._dead_zone(value, self.deadzone_threshold_movement)
     
@@ -0,0 +1,130 @@
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+# Stick values are 11-bit, every raw value has a precomputed entry
+LUT_SIZE = 2048
+LUT_MASK = LUT_SIZE - 1
+
+# Sides moved less than this during calibration keep their previous throw
+MIN_TRAVEL = 100
+
+CALIBRATION_FILE = os.path.join(os.path.expanduser("~"), ".dji_rc_to_keyboard_calibration.json")
+
+# Raw value at full negative deflection, at rest and at full positive deflection
+AxisCalibration = namedtuple('AxisCalibration', 'min center max')
+
+
+def default_calibration(layout):
+    """Nominal calibration from the layout's center/throw, used until a unit is calibrated."""
+    return {field.name: AxisCalibration(field.center - field.throw, field.center, field.center + field.throw)
+            for field in layout.axes}
+
+
+def build_lut(calibration, threshold=0.0, curve=1.0):
+    """
+    Raw value -> normalized value for every raw value of one axis, with the
+    calibration, clamp, deadzone and response curve (|v| ** curve) folded in.
+    """
+    low, center, high = calibration
+    neg_scale = 1.0 / max(center - low, 1)
+    pos_scale = 1.0 / max(high - center, 1)
+
+    lut = []
+    for raw in range(LUT_SIZE):
+        val = (raw - center) * (pos_scale if raw >= center else neg_scale)
+        if val > 1.0: val = 1.0
+        elif val < -1.0: val = -1.0
+        if abs(val) < threshold:
+            val = 0.0
+        elif curve != 1.0:
+            val = abs(val) ** curve * (1 if val > 0 else -1)
+        lut.append(val)
+    return tuple(lut)
+
+
+# --- Storage, one entry per controller (USB serial number, or model and port) ---
+def _load_file():
+    try:
+        with open(CALIBRATION_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_calibration(key):
+    """Stored calibration of a controller, None if it was never calibrated."""
+    entry = _load_file().get(key)
+    if not entry:
+        return None
+    return {name: AxisCalibration(*values) for name, values in entry.items()}
+
+
+def save_calibration(key, calibration):
+    stored = _load_file()
+    stored[key] = {name: list(values) for name, values in calibration.items()}
+    with open(CALIBRATION_FILE, 'w') as f:
+        json.dump(stored, f, indent=2)
+
+
+# --- Interactive calibration ---
+def run_calibration(rc, center_time=3.0, interval=0.005):
+    """
+    Measures the unit behind a DumlRemoteController:
+    the sticks rest for center_time seconds, then get moved to every extent
+    until Enter is pressed. Stores the result under rc.calibration_key and
+    recompiles the controller's decoder with it.
+    """
+    def collect(until):
+        while not until():
+            raw = rc.read_raw()
+            if raw:
+                yield raw
+            time.sleep(interval)
+
+    print(f"Leave every stick and the wheel centered ({center_time:g} s)...")
+    deadline = time.monotonic() + center_time
+    sums, counts = {}, {}
+    for raw in collect(lambda: time.monotonic() >= deadline):
+        for name, value in raw.items():
+            sums[name] = sums.get(name, 0) + value
+            counts[name] = counts.get(name, 0) + 1
+    if not counts:
+        print("No stick data received, calibration aborted.")
+        return None
+    centers = {name: round(sums[name] / counts[name]) for name in sums}
+
+    print("Now move every stick and the wheel to all its extents, then press Enter.")
+    done = threading.Event()
+
+    def wait_for_enter():
+        try:
+            input()
+        except EOFError:
+            pass  # No console (stdin closed), stop right away
+        done.set()
+
+    threading.Thread(target=wait_for_enter, daemon=True).start()
+    lows, highs = dict(centers), dict(centers)
+    for raw in collect(done.is_set):
+        for name, value in raw.items():
+            if value < lows[name]: lows[name] = value
+            if value > highs[name]: highs[name] = value
+
+    calibration = {}
+    for name, center in centers.items():
+        previous = rc.decoder.calibration[name]
+        low, high = lows[name], highs[name]
+        if center - low < MIN_TRAVEL:
+            low = center - (previous.center - previous.min)
+        if high - center < MIN_TRAVEL:
+            high = center + (previous.max - previous.center)
+        calibration[name] = AxisCalibration(low, center, high)
+        print(f"  {name:9s} min {low:5d} | center {center:5d} | max {high:5d}")
+
+    save_calibration(rc.calibration_key, calibration)
+    rc.set_calibration(calibration)
+    print(f"Calibration of {rc.calibration_key} saved to {CALIBRATION_FILE}")
+    return calibration
@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+import time
+from .base_rc import RCConnectionError
+from src.utils.event_log import log
+
+DJI_VID = 0x2CA3
+# Descriptions of the DJI virtual COM ports, the protocol port is the one we want
+DJI_DESCRIPTIONS = ("For Protocol", "DJI")
+
+PORT_CACHE = os.path.join(os.path.expanduser("~"), ".dji_rc_to_keyboard.json")
+
+# Ports held by a controller of this process: discovery skips them, so two
+# members of a MultiController (or their reconnect threads) never share one
+_claimed_ports = set()
+_claim_lock = threading.Lock()
+
+
+# --- Port discovery ---
+def _load_cache():
+    try:
+        with open(PORT_CACHE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def remember_port(model, port):
+    """Stores the last port a model connected on, tried first next time."""
+    cache = _load_cache()
+    if cache.get(model) == port:
+        return
+    cache[model] = port
+    try:
+        with open(PORT_CACHE, 'w') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+
+def claim_port(port):
+    """Reserves a port for one controller. Returns False if another one holds it."""
+    with _claim_lock:
+        if port in _claimed_ports:
+            return False
+        _claimed_ports.add(port)
+        return True
+
+
+def release_port(port):
+    with _claim_lock:
+        _claimed_ports.discard(port)
+
+
+def find_dji_ports(model=None):
+    """
+    Lists candidate DJI serial ports, best match first:
+    the cached port of `model`, then 'For Protocol' ports, then any other DJI port.
+    Ports already claimed by another controller are left out.
+    """
+    import serial.tools.list_ports
+
+    scored = []
+    for info in serial.tools.list_ports.comports():
+        description = info.description or ""
+        if "For Protocol" in description:
+            scored.append((0, info.device))
+        elif info.vid == DJI_VID or any(name in description for name in DJI_DESCRIPTIONS):
+            scored.append((1, info.device))
+    ports = [device for _, device in sorted(scored) if device not in _claimed_ports]
+
+    cached = _load_cache().get(model) if model else None
+    if cached in ports:
+        ports.remove(cached)
+        ports.insert(0, cached)
+    return ports
+
+
+def port_serial_number(port):
+    """USB serial number of the device behind a port, None if the OS doesn't report one."""
+    import serial.tools.list_ports
+
+    for info in serial.tools.list_ports.comports():
+        if info.device == port:
+            return info.serial_number or None
+    return None
+
+
+# --- Connection manager ---
+class ConnectionManager:
+    """
+    Creates the controller and brings it back after it goes away.
+
+    factory() builds a connected controller or raises RCConnectionError.
+    Reconnection retries with bounded exponential backoff, either on a
+    background thread (serial drivers) or inline from poll() for drivers
+    that must stay on the main thread (pygame).
+    """
+    def __init__(self, factory, background=True, backoff_min=0.05, backoff_max=2.0):
+        self.factory = factory
+        self.background = background
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+
+        self.reconnecting = False
+        self.reconnects = 0
+        self._ready = None      # Controller built by the reconnect thread
+        self._thread = None
+        self._stop = threading.Event()
+        self._backoff = backoff_min
+        self._next_attempt = 0.0
+
+    def _attempt(self):
+        try:
+            return self.factory()
+        except RCConnectionError as e:
+            log("Reconnect failed: {}", e)
+            return None
+
+    def connect(self, retry_limit=15):
+        """Blocking initial connection. Returns None if every attempt failed."""
+        backoff = self.backoff_min
+        for retry in range(retry_limit):
+            try:
+                return self.factory()
+            except RCConnectionError as e:
+                print(f"Retrying... [{retry}/{retry_limit}] {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, self.backoff_max)
+        return None
+
+    def start_reconnect(self):
+        if self.reconnecting:
+            return
+        self.reconnecting = True
+        self._ready = None
+        self._backoff = self.backoff_min
+        self._next_attempt = time.monotonic()
+
+        if self.background:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._reconnect_loop, name="Reconnect", daemon=True)
+            self._thread.start()
+
+    def _reconnect_loop(self):
+        backoff = self.backoff_min
+        while not self._stop.is_set():
+            rc = self._attempt()
+            if rc is not None:
+                self._ready = rc
+                return
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, self.backoff_max)
+
+    def poll(self):
+        """
+        Non-blocking, call every frame while reconnecting.
+        Returns: the new controller once it is connected, None otherwise.
+        """
+        if not self.reconnecting:
+            return None
+
+        if not self.background:
+            now = time.monotonic()
+            if now >= self._next_attempt:
+                self._ready = self._attempt()
+                self._next_attempt = now + self._backoff
+                self._backoff = min(self._backoff * 2, self.backoff_max)
+
+        rc, self._ready = self._ready, None
+        if rc is not None:
+            self.reconnecting = False
+            self.reconnects += 1
+            self._thread = None
+        return rc
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        rc, self._ready = self._ready, None
+        if rc is not None:
+            rc.close()
+        self.reconnecting = False
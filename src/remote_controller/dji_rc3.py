@@ -1,5 +1,7 @@
 import pygame
 from .base_rc import BaseRemoteController, RCConnectionError
+from src.utils.capture import KIND_SNAPSHOT, SNAPSHOT
+from src.utils.event_log import log
 
 buttons = [
     ['c1', False],
@@ -8,13 +10,47 @@ buttons = [
     ['start_stop', False],
 ]
 
+# Standard DJI RC3 HID Layout
+AXIS_ROLL, AXIS_PITCH, AXIS_THROTTLE, AXIS_YAW = 0, 1, 2, 3
+BTN_C1, BTN_START_STOP, BTN_PAUSE, BTN_TRIGGER = 0, 1, 2, 3
+BTN_AUX_CENTER, BTN_AUX_UP, BTN_MODE_RIGHT, BTN_MODE_LEFT = 4, 5, 6, 7
+SWITCH_BUTTONS = (BTN_AUX_CENTER, BTN_AUX_UP, BTN_MODE_RIGHT, BTN_MODE_LEFT)
+
+
+def bank_mask(raw):
+    """Packs the HID button states (list or bitmask) into a ButtonBank mask, bits in `buttons` order."""
+    if isinstance(raw, int):
+        return (raw >> BTN_C1 & 1) | (raw >> BTN_PAUSE & 1) << 1 | (raw >> BTN_TRIGGER & 1) << 2 | (raw >> BTN_START_STOP & 1) << 3
+    return raw[BTN_C1] | raw[BTN_PAUSE] << 1 | raw[BTN_TRIGGER] << 2 | raw[BTN_START_STOP] << 3
+
+
+def apply_snapshot(rc, axes, button_mask, now=None):
+    """
+    Applies a raw RC3 state (e.g. from a capture) to a controller, same mapping as polling.
+    now: button timestamp, a replay passes the capture time so long presses keep their length.
+    """
+    rc.roll     = rc.dead_zone_movement(axes[AXIS_ROLL])
+    rc.pitch    = rc.dead_zone_movement(axes[AXIS_PITCH])
+    rc.throttle = rc.dead_zone_elevation(axes[AXIS_THROTTLE])
+    rc.yaw      = rc.dead_zone_movement(axes[AXIS_YAW])
+
+    rc.buttons.update(bank_mask(button_mask), now)
+
+    rc.sw1 = -1 if button_mask >> BTN_MODE_LEFT & 1 else 1 if button_mask >> BTN_MODE_RIGHT & 1 else 0
+    rc.sw2 = 1 if button_mask >> BTN_AUX_UP & 1 else 0 if button_mask >> BTN_AUX_CENTER & 1 else -1
+    rc.tilt = rc.sw2
+
+
 class DJIRC3(BaseRemoteController):
-    def __init__(self, joystick_index=0, deadzone_threshold_movement=0.1, deadzone_threshold_elevation=0.1):
+    def __init__(self, joystick_index=0, deadzone_threshold_movement=0.1, deadzone_threshold_elevation=0.1, event_driven=False):
         super().__init__(buttons, deadzone_threshold_movement=deadzone_threshold_movement, deadzone_threshold_elevation=deadzone_threshold_elevation)
+        self.event_driven = event_driven
         
-        # 1. Initialize Pygame core if not already done
-        if not pygame.get_init():
-            pygame.init()
+        # 1. Initialize only what we need: the joystick, plus the display
+        # subsystem because pygame's event queue refuses to run without it.
+        # pygame.init() would also start audio, fonts, etc.
+        if not pygame.display.get_init():
+            pygame.display.init()
             
         # This tells Pygame to ask the OS for the current list of USB devices again.
         if pygame.joystick.get_init():
@@ -33,10 +69,83 @@ class DJIRC3(BaseRemoteController):
             # Re-raise as a generic exception so your main loop catches it
             raise RCConnectionError(f"DJI RC3 not found at index {joystick_index}: {e}")
 
+        if self.event_driven:
+            self._init_event_state()
+
+    def _init_event_state(self):
+        """Reads the full state once, afterwards only the events change it."""
+        self._instance_id = self.js.get_instance_id()
+        self._connected = True
+
+        self._axis_handlers = {
+            AXIS_ROLL:     ('roll', self.dead_zone_movement),
+            AXIS_PITCH:    ('pitch', self.dead_zone_movement),
+            AXIS_THROTTLE: ('throttle', self.dead_zone_elevation),
+            AXIS_YAW:      ('yaw', self.dead_zone_movement),
+        }
+        for axis, (name, dead_zone) in self._axis_handlers.items():
+            setattr(self, name, dead_zone(self.js.get_axis(axis)))
+
+        num_buttons = self.js.get_numbuttons()
+        self._raw_buttons = [i < num_buttons and bool(self.js.get_button(i)) for i in range(max(num_buttons, 8))]
+        self._update_switches()
+
+    def _update_switches(self):
+        raw = self._raw_buttons
+        self.sw1 = -1 if raw[BTN_MODE_LEFT] else 1 if raw[BTN_MODE_RIGHT] else 0 # mode
+        self.sw2 = 1 if raw[BTN_AUX_UP] else 0 if raw[BTN_AUX_CENTER] else -1 # aux
+        self.tilt = self.sw2
+
+    def _update_from_events(self):
+        """Single pass over the pygame queue, only touching the fields that changed."""
+        switches_changed = False
+
+        for event in pygame.event.get():
+            if event.type == pygame.JOYAXISMOTION:
+                if event.instance_id != self._instance_id: continue
+                handler = self._axis_handlers.get(event.axis)
+                if handler:
+                    name, dead_zone = handler
+                    setattr(self, name, dead_zone(event.value))
+
+            elif event.type == pygame.JOYBUTTONDOWN or event.type == pygame.JOYBUTTONUP:
+                if event.instance_id != self._instance_id: continue
+                if event.button < len(self._raw_buttons):
+                    self._raw_buttons[event.button] = event.type == pygame.JOYBUTTONDOWN
+                    if event.button in SWITCH_BUTTONS:
+                        switches_changed = True
+
+            elif event.type == pygame.JOYDEVICEREMOVED:
+                if event.instance_id == self._instance_id:
+                    self._connected = False
+                    return False
+
+        if switches_changed:
+            self._update_switches()
+
+        # The bank still ticks every frame so long-press timing keeps running
+        self.buttons.update(bank_mask(self._raw_buttons))
+        return True
+
+    def _capture_snapshot(self):
+        js = self.js
+        button_mask = 0
+        for i in range(min(js.get_numbuttons(), 16)):
+            if js.get_button(i):
+                button_mask |= 1 << i
+        axes = [js.get_axis(i) for i in (AXIS_ROLL, AXIS_PITCH, AXIS_THROTTLE, AXIS_YAW)]
+        self.recorder.write(KIND_SNAPSHOT, SNAPSHOT.pack(*axes, button_mask))
+
     def update(self):
         if not self.js:
             return False
 
+        ok = self._update_from_events() if self.event_driven else self._poll()
+        if ok and self.recorder is not None:
+            self._capture_snapshot()
+        return ok
+
+    def _poll(self):
         pygame.event.pump()
         
         try:
@@ -48,10 +157,11 @@ class DJIRC3(BaseRemoteController):
             self.yaw      = self.dead_zone_movement(self.js.get_axis(3))
 
             # --- Digital Button Mapping ---
-            self.button1.update(bool(self.js.get_button(0))) # c1
-            self.button2.update(bool(self.js.get_button(2))) # pause
-            self.button3.update(bool(self.js.get_button(3))) # trigger
-            self.button4.update(bool(self.js.get_button(1))) # start_stop
+            get_button = self.js.get_button
+            self.buttons.update(bool(get_button(0))        # c1
+                                | bool(get_button(2)) << 1 # pause
+                                | bool(get_button(3)) << 2 # trigger
+                                | bool(get_button(1)) << 3) # start_stop
 
             # --- Switch Mapping ---
             self.sw1 = -1 if bool(self.js.get_button(7)) else 1 if bool(self.js.get_button(6)) else 0 # mode
@@ -62,11 +172,15 @@ class DJIRC3(BaseRemoteController):
             return True
 
         except pygame.error:
-            print('pygame.error')
+            log('pygame.error')
             return False
         
     @property
     def is_connected(self) -> bool:
+        if self.event_driven:
+            # Removal arrives as a JOYDEVICEREMOVED event during update()
+            return self._connected
+
         import pygame
         pygame.event.pump() 
         try:
@@ -75,5 +189,6 @@ class DJIRC3(BaseRemoteController):
             return False
 
     def close(self):
+        self.stop_capture()
         if self.js:
             self.js.quit()
@@ -0,0 +1,175 @@
+import time
+import serial
+from .base_rc import BaseRemoteController, RCConnectionError
+from src.utils.duml import DumlFramer
+from src.utils.capture import KIND_DUML
+from src.utils.event_log import log
+from .connection import find_dji_ports, remember_port, port_serial_number, claim_port, release_port
+from .calibration import load_calibration
+from .pipeline import RequestPipeline
+
+class DumlRemoteController(BaseRemoteController):
+    """
+    Shared driver for DJI controllers that stream DUML frames over a serial port.
+    A model only declares its packets and PacketLayout as class attributes.
+
+    Stick requests go through a RequestPipeline: up to pipeline_depth of them
+    are in flight, replies are matched by sequence number and the request
+    interval adapts to the fastest rate the controller keeps answering.
+
+    curves: dict axis -> response curve exponent, folded into the lookup tables.
+    """
+    MODEL_NAME = "DJI DUML RC"
+    DEFAULT_PORT = None   # Tried when port discovery finds nothing
+    ENABLE_PACKET = b''   # Sent once after opening the port (simulator enable)
+    REQUEST_PACKET = b''  # Stick data request, re-sequenced by the RequestPipeline
+    LAYOUT = None         # PacketLayout of the stick data reply
+    VERIFY_CRC = True     # Drop frames whose CRC16 doesn't match
+
+    supports_acquisition = True
+
+    def __init__(self, buttons, port, baudrate=115200, deadzone_threshold_movement=0.1, deadzone_threshold_elevation=0.1,
+                 pipeline_depth=2, curves=None):
+        super().__init__(buttons, deadzone_threshold_movement=deadzone_threshold_movement, deadzone_threshold_elevation=deadzone_threshold_elevation)
+
+        self.port = None
+        self.io_error = None
+        self.framer = DumlFramer(verify_crc=self.VERIFY_CRC)
+        self.thresholds = {
+            'movement': deadzone_threshold_movement,
+            'elevation': deadzone_threshold_elevation,
+        }
+        self.curves = curves
+        self.decoder = self.LAYOUT.compile(self.thresholds, curves=curves)
+        self.pipeline = RequestPipeline(self.REQUEST_PACKET, depth=pipeline_depth)
+
+        # Explicit port, otherwise discovered DJI ports (last good one first)
+        if port:
+            candidates = [port]
+        else:
+            candidates = find_dji_ports(type(self).__name__) or ([self.DEFAULT_PORT] if self.DEFAULT_PORT else [])
+        if not candidates:
+            raise RCConnectionError(f"No {self.MODEL_NAME} serial port found")
+
+        self.ser = None
+        self.port_confirmed = False  # Cached for the next run once a stick frame came back
+        errors = []
+        for candidate in candidates:
+            if not claim_port(candidate):
+                errors.append(f"{candidate}: in use by another controller")
+                continue
+            try:
+                self.ser = serial.Serial(candidate, baudrate, timeout=0)
+                if self.ENABLE_PACKET:
+                    self.ser.write(self.ENABLE_PACKET)
+            except serial.SerialException as e:
+                if self.ser is not None:
+                    self.ser.close()
+                self.ser = None
+                release_port(candidate)
+                errors.append(f"{candidate}: {e}")
+                continue
+            self.port = candidate
+            log("{} connected on {}", self.MODEL_NAME, candidate)
+            break
+
+        if self.ser is None:
+            raise RCConnectionError(f"Could not open serial port {'; '.join(errors)}")
+
+        # Per-unit calibration, keyed by the USB serial number when the OS reports one
+        serial_number = port_serial_number(self.port)
+        self.calibration_key = f"{type(self).__name__}:{serial_number or self.port}"
+        calibration = load_calibration(self.calibration_key)
+        if calibration:
+            self.set_calibration(calibration)
+            log("Loaded calibration for {}", self.calibration_key)
+
+    def set_calibration(self, calibration):
+        """Rebuilds the lookup tables for a unit's calibration (dict axis -> AxisCalibration)."""
+        self.decoder = self.LAYOUT.compile(self.thresholds, calibration, self.curves)
+
+    def read_raw(self):
+        """Like read_sample() but returns the undecoded axis values by name, for calibration."""
+        self.ser.write(self.REQUEST_PACKET)
+        self.framer.feed(self.ser)
+
+        raw = None
+        for frame in self.framer.frames():
+            if self.LAYOUT.matches(frame):
+                raw = self.LAYOUT.raw_values(frame)
+        if raw is not None and not self.port_confirmed:
+            self._confirm_port()
+        return raw
+
+    def _confirm_port(self):
+        # Only a port that answered with stick data is worth trying first next time
+        self.port_confirmed = True
+        remember_port(type(self).__name__, self.port)
+
+    def read_sample(self):
+        # Top up the requests in flight, never wait for a reply:
+        # answers are picked up by this or one of the next polls.
+        now = time.perf_counter()
+        pipeline = self.pipeline
+        pipeline.expire(now)
+        while pipeline.due(now):
+            self.ser.write(pipeline.next_request(now))
+
+        # Drain whatever the RC has sent so far
+        self.framer.feed(self.ser)
+        received = time.perf_counter()
+
+        sample = None
+        layout = self.LAYOUT
+        recorder = self.recorder
+        for frame in self.framer.frames():
+            if recorder is not None:
+                recorder.write(KIND_DUML, frame)
+            if layout.matches(frame):
+                # Late or streamed replies still carry the current stick state
+                pipeline.on_reply(frame, received)
+                sample = self.decoder.decode(frame)
+        if sample is not None and not self.port_confirmed:
+            self._confirm_port()
+        return sample
+
+    def update(self):
+        if not self.ser:
+            return False
+
+        if self.acquiring:
+            return self._update_from_acquisition()
+
+        try:
+            sample = self.read_sample()
+            if sample is not None:
+                self.apply_sample(sample)
+
+            # No new frame just means the sticks keep their last values
+            return True
+
+        except serial.SerialException as e:
+            # Unplugged: the port object stays 'open' but every I/O call fails
+            self.io_error = e
+            log("{} Update Error: {}", self.MODEL_NAME, e)
+            return False
+
+        except Exception as e:
+            log("{} Update Error: {}", self.MODEL_NAME, e)
+            return False
+
+    @property
+    def is_connected(self) -> bool:
+        # Check if the serial object exists, the OS hasn't closed the port
+        # and neither the loop nor the reader thread hit an I/O error
+        return (self.ser is not None and self.ser.is_open
+                and self.io_error is None and self.acq_error is None)
+
+    def close(self):
+        if self.pipeline.sent:
+            log("{} requests: {}", self.MODEL_NAME, self.pipeline.summary())
+        self.stop_acquisition()
+        self.stop_capture()
+        if self.ser:
+            self.ser.close()
+            release_port(self.port)
@@ -0,0 +1,106 @@
+import struct
+from collections import namedtuple
+from .base_rc import SAMPLE_AXES
+from .calibration import LUT_MASK, build_lut, default_calibration
+
+# One analog value inside a DUML frame.
+#   offset: byte index from the 0x55 start byte
+#   fmt:    struct code of the raw value (little-endian)
+#   center/throw: raw value at rest and raw distance to full deflection
+#   zone:   which deadzone threshold applies ('movement' or 'elevation')
+AxisField = namedtuple('AxisField', 'name offset fmt center throw zone',
+                       defaults=('H', 1024, 660, 'movement'))
+
+
+class PacketLayout:
+    """
+    Declarative description of where a controller puts its sticks in a frame.
+    The fields are compiled once into a single struct.Struct so a whole frame
+    decodes with one unpack_from() call.
+
+    command is the (cmd_set, cmd_id) of the stick reply, frame bytes 9 and 10.
+    Frames of other commands never match, even when they are long enough.
+    """
+    def __init__(self, frame_size, axes, exact_size=True, command=None):
+        self.frame_size = frame_size
+        self.exact_size = exact_size
+        self.command = command
+        self.axes = list(axes)
+
+        for field in self.axes:
+            if field.name not in SAMPLE_AXES:
+                raise ValueError(f"Unknown axis '{field.name}', expected one of {SAMPLE_AXES}")
+
+        # --- Compile the field list into one struct format ---
+        fmt = '<'
+        pos = 0
+        ordered = sorted(self.axes, key=lambda f: f.offset)
+        for field in ordered:
+            if field.offset < pos:
+                raise ValueError(f"Axis '{field.name}' overlaps the previous field")
+            if field.offset > pos:
+                fmt += f'{field.offset - pos}x'
+            fmt += field.fmt
+            pos = field.offset + struct.calcsize('<' + field.fmt)
+
+        if pos > frame_size:
+            raise ValueError(f"Layout needs {pos} bytes but frames are {frame_size}")
+
+        self.struct = struct.Struct(fmt)
+        self._ordered = ordered
+
+    def matches(self, frame) -> bool:
+        n = len(frame)
+        if not (n == self.frame_size if self.exact_size else n >= self.frame_size):
+            return False
+        command = self.command
+        return command is None or (frame[9], frame[10]) == command
+
+    def raw_values(self, frame):
+        """Undecoded axis values by name, for calibration."""
+        return {field.name: value for field, value in zip(self._ordered, self.struct.unpack_from(frame))}
+
+    def compile(self, thresholds, calibration=None, curves=None):
+        """
+        Binds the layout to a controller's deadzones and calibration.
+        thresholds:  dict zone -> threshold, e.g. {'movement': 0.1, 'elevation': 0.1}
+        calibration: dict axis -> AxisCalibration, the layout's nominal center/throw if omitted
+        curves:      dict axis -> response curve exponent (1.0 is linear)
+        """
+        return PacketDecoder(self, thresholds, calibration, curves)
+
+
+class PacketDecoder:
+    """
+    A PacketLayout with one lookup table per axis, ready for the hot path.
+    Calibration, clamp, deadzone and response curve are all folded into the
+    tables, so decoding a value is a single index.
+    """
+    def __init__(self, layout, thresholds, calibration=None, curves=None):
+        self.layout = layout
+        self.unpack_from = layout.struct.unpack_from
+        self.calibration = dict(default_calibration(layout))
+        if calibration:
+            self.calibration.update(calibration)
+        curves = curves or {}
+
+        # One entry per SAMPLE_AXES slot: (raw index, lookup table). Axes the
+        # layout doesn't have read raw value 0 through an all-zero table.
+        raw_index = {field.name: i for i, field in enumerate(layout._ordered)}
+        fields = {field.name: field for field in layout._ordered}
+        zeros = (0.0,) * (LUT_MASK + 1)
+        plan = []
+        for name in SAMPLE_AXES:
+            field = fields.get(name)
+            if field is None:
+                plan.append((0, zeros))
+            else:
+                lut = build_lut(self.calibration[name], thresholds[field.zone], curves.get(name, 1.0))
+                plan.append((raw_index[name], lut))
+        self._plan = tuple(plan)
+
+    def decode(self, frame):
+        """Returns a sample tuple in SAMPLE_AXES order: normalized, clamped and deadzoned."""
+        raw = self.unpack_from(frame)
+        # Saturate instead of wrapping: a corrupted 2100 must still read as full positive deflection
+        return tuple([lut[min(raw[index], LUT_MASK)] for index, lut in self._plan])
@@ -0,0 +1,175 @@
+import time
+from .base_rc import BaseRemoteController, RCConnectionError, SAMPLE_AXES
+from src.utils.event_log import log
+
+buttons = [
+    ['button1', False],
+    ['button2', False],
+    ['button3', False],
+    ['button4', False],
+]
+
+MERGE_POLICIES = ('priority', 'axes', 'max')
+
+# Things a member can own with the 'axes' policy, besides the sticks
+OWNABLE = SAMPLE_AXES + ('buttons', 'switches')
+
+IDLE_SAMPLE = (0.0,) * len(SAMPLE_AXES)
+
+# Sample slots that show a pilot is flying: the sticks, not the camera tilt wheel
+ACTIVITY_SLOTS = SAMPLE_AXES.index('tilt')
+
+
+class _Member:
+    """One controller of a MultiController and the last state it reported."""
+    __slots__ = ('name', 'connection', 'rc', 'sample', 'mask', 'switches', 'last_active')
+
+    def __init__(self, name, connection):
+        self.name = name
+        self.connection = connection
+        self.rc = None
+        self.clear()
+
+    def clear(self):
+        self.sample = IDLE_SAMPLE
+        self.mask = 0
+        self.switches = (0, 0)
+        self.last_active = float('-inf')
+
+
+class MultiController(BaseRemoteController):
+    """
+    Several controllers driving one keyboard, e.g. a pilot and an observer.
+
+    members: list of (name, ConnectionManager), highest priority first.
+    policy:
+      'priority' - the highest-priority controller that moved in the last
+                   idle_timeout seconds owns everything, lower ones take over when it idles.
+                   Only roll/pitch/throttle/yaw beyond activity_threshold and button
+                   presses count as moving: a resting stick's noise, a parked tilt
+                   wheel, a switch position or a held button don't hold control
+      'axes'     - owners maps each axis (and 'buttons'/'switches') to a member index
+      'max'      - every axis takes the value with the largest magnitude, buttons are OR-ed
+
+    Serial members read on their own acquisition thread, so update() only
+    picks up published samples and a slow port never stalls the others.
+    pygame members are polled here because pygame must stay on the main thread.
+    Members that drop out reconnect on their own while the rest keep working.
+    """
+    def __init__(self, members, policy='priority', owners=None, idle_timeout=0.5, activity_threshold=0.1):
+        super().__init__(buttons, deadzone_threshold_movement=0.0, deadzone_threshold_elevation=0.0)
+        if policy not in MERGE_POLICIES:
+            raise ValueError(f"Unknown merge policy '{policy}', expected one of {MERGE_POLICIES}")
+        self.policy = policy
+        self.idle_timeout = idle_timeout
+        self.activity_threshold = activity_threshold
+        self.members = [_Member(name, connection) for name, connection in members]
+
+        # 'axes' policy: member index per SAMPLE_AXES slot, then buttons and switches
+        owners = owners or {}
+        for key, index in owners.items():
+            if key not in OWNABLE:
+                raise ValueError(f"Unknown owned input '{key}', expected one of {OWNABLE}")
+            if not 0 <= index < len(self.members):
+                raise ValueError(f"Owner of '{key}' must be a controller index below {len(self.members)}")
+        self._owners = tuple(owners.get(key, 0) for key in OWNABLE)
+        self._merge = {'priority': self._merge_priority, 'axes': self._merge_axes, 'max': self._merge_max}[policy]
+        self.owner = 0  # 'priority': member currently in control
+
+        for member in self.members:
+            member.rc = member.connection.connect(retry_limit=3)
+            if member.rc is not None:
+                self._prepare(member.rc)
+        if all(member.rc is None for member in self.members):
+            # No background reconnects yet: the outer ConnectionManager retries the whole set
+            raise RCConnectionError("None of the controllers could be connected")
+        for member in self.members:
+            if member.rc is None:
+                log("{} not available, will keep trying", member.name)
+                member.connection.start_reconnect()
+
+    def _prepare(self, rc):
+        if rc.supports_acquisition:
+            rc.start_acquisition()
+
+    # --- Members ---
+    def _poll_member(self, member, now):
+        rc = member.rc
+        if rc is None or not rc.is_connected:
+            if rc is not None:
+                log("[!!!] {} disconnected, reconnecting... [!!!]", member.name)
+                rc.close()
+                member.rc = None
+                member.clear()
+                member.connection.start_reconnect()
+            rc = member.connection.poll()
+            if rc is None:
+                return
+            self._prepare(rc)
+            member.rc = rc
+            log("[OK] {} reconnected", member.name)
+
+        if not rc.update():
+            return
+        pressed_edge = rc.buttons.pressed & ~member.mask
+        member.sample = (rc.roll, rc.pitch, rc.throttle, rc.yaw, rc.tilt)
+        member.mask = rc.buttons.pressed
+        member.switches = (rc.sw1, rc.sw2)
+        threshold = self.activity_threshold
+        if pressed_edge or any(abs(value) >= threshold for value in member.sample[:ACTIVITY_SLOTS]):
+            member.last_active = now
+
+    def update(self):
+        now = time.monotonic()
+        for member in self.members:
+            self._poll_member(member, now)
+        sample, mask, switches = self._merge(now)
+        self.apply_sample(sample)
+        self.sw1, self.sw2 = switches
+        self.buttons.update(mask, now)
+        return True
+
+    # --- Merge policies ---
+    def _merge_priority(self, now):
+        members = self.members
+        owner = self.owner
+        # The highest-priority controller that moved recently; if none did, the owner stays
+        for index, member in enumerate(members):
+            if member.rc is not None and now - member.last_active <= self.idle_timeout:
+                owner = index
+                break
+
+        if owner != self.owner:
+            log(">>> {} takes control <<<", members[owner].name)
+            self.owner = owner
+        member = members[owner]
+        return member.sample, member.mask, member.switches
+
+    def _merge_axes(self, now):
+        members = self.members
+        owners = self._owners
+        sample = tuple(members[owners[slot]].sample[slot] for slot in range(len(SAMPLE_AXES)))
+        return sample, members[owners[-2]].mask, members[owners[-1]].switches
+
+    def _merge_max(self, now):
+        members = self.members
+        sample = list(members[0].sample)
+        mask = members[0].mask
+        for member in members[1:]:
+            for slot, value in enumerate(member.sample):
+                if abs(value) > abs(sample[slot]):
+                    sample[slot] = value
+            mask |= member.mask
+        return tuple(sample), mask, members[self._owners[-1]].switches
+
+    @property
+    def is_connected(self) -> bool:
+        # One controller left is enough, the others reconnect in the background
+        return any(member.rc is not None and member.rc.is_connected for member in self.members)
+
+    def close(self):
+        for member in self.members:
+            member.connection.stop()
+            if member.rc is not None:
+                member.rc.close()
+                member.rc = None
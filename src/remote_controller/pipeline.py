@@ -0,0 +1,150 @@
+from src.utils.duml import build_frame
+
+
+class RequestPipeline:
+    """
+    Keeps up to `depth` stick requests in flight on a DUML link and matches the
+    replies to them by sequence number (frame bytes 6-7), so the sample rate is
+    bound by what the controller answers instead of by one round trip.
+
+    Every request is the driver's REQUEST_PACKET re-sequenced with build_frame().
+    A request counts as lost when a reply to a later one arrives first (the link
+    is FIFO) or after `timeout` seconds.
+
+    The interval between requests adapts every `window` seconds: it shrinks by
+    `step` while everything gets answered and backs off by `backoff` when more
+    than `max_loss` of the requests went unanswered, within
+    [min_interval, max_interval]. It never goes below latency / depth, since the
+    in-flight limit is reached earlier anyway, nor below the last interval that
+    lost requests until `probe_after` clean windows have passed.
+    """
+    def __init__(self, request_packet, depth=2, min_interval=0.001, max_interval=0.02, timeout=0.1,
+                 window=0.5, max_loss=0.02, step=0.75, backoff=1.5, probe_after=10):
+        if depth < 1:
+            raise ValueError(f"Pipeline depth must be at least 1, got {depth}")
+        packet = request_packet
+        self._src, self._dst = packet[4], packet[5]
+        self._seq = packet[6] | packet[7] << 8
+        self._command = (packet[8], packet[9], packet[10])
+        self._payload = bytes(packet[11:-2])
+        self._version = packet[2] >> 2
+
+        self.depth = depth
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self.window = window
+        self.max_loss = max_loss
+        self.step = step
+        self.backoff = backoff
+        self.probe_after = probe_after
+        self.reset()
+
+    def reset(self):
+        self.in_flight = {}   # seq -> send time, oldest first
+        self.interval = self.max_interval
+        self.next_send = 0.0
+        self._lossy_interval = 0.0  # Last interval the controller couldn't keep up with
+        self._clean_windows = 0
+
+        # Totals
+        self.sent = 0
+        self.answered = 0
+        self.lost = 0
+        self.unmatched = 0    # Replies to no pending request (late, streamed or foreign)
+
+        # Last window
+        self.latency = None   # Mean reply latency (seconds)
+        self.rate = 0.0       # Answered requests per second
+        self.window_start = None
+        self._window_answered = 0
+        self._window_lost = 0
+        self._window_latency = 0.0
+
+    # --- Requests ---
+    def due(self, now):
+        return len(self.in_flight) < self.depth and now >= self.next_send
+
+    def next_request(self, now):
+        """Next request frame; the caller writes it to the port right away."""
+        seq = self._seq = (self._seq + 1) & 0xFFFF
+        self.in_flight[seq] = now
+        self.next_send = now + self.interval
+        self.sent += 1
+        return build_frame(self._src, self._dst, seq, *self._command, self._payload, self._version)
+
+    # --- Replies ---
+    def on_reply(self, frame, now):
+        """Matches a stick reply to its request. Returns False if it answers none of them."""
+        sent_at = self.in_flight.pop(frame[6] | frame[7] << 8, None)
+        if sent_at is None:
+            self.unmatched += 1
+            return False
+
+        # FIFO link: whatever was sent before this request is not coming back
+        in_flight = self.in_flight
+        while in_flight:
+            oldest = next(iter(in_flight))
+            if in_flight[oldest] > sent_at:
+                break
+            del in_flight[oldest]
+            self._lose()
+
+        self.answered += 1
+        self._window_answered += 1
+        self._window_latency += now - sent_at
+        return True
+
+    def _lose(self):
+        self.lost += 1
+        self._window_lost += 1
+
+    def expire(self, now):
+        """Drops timed-out requests and adapts the interval once per window. Call once per poll."""
+        in_flight = self.in_flight
+        deadline = now - self.timeout
+        while in_flight:
+            oldest = next(iter(in_flight))
+            if in_flight[oldest] > deadline:
+                break
+            del in_flight[oldest]
+            self._lose()
+
+        if self.window_start is None:
+            self.window_start = now
+        elif now - self.window_start >= self.window:
+            self._adapt(now)
+
+    def _adapt(self, now):
+        elapsed = now - self.window_start
+        answered = self._window_answered
+        self.rate = answered / elapsed
+        if answered:
+            self.latency = self._window_latency / answered
+
+        settled = self._window_answered + self._window_lost
+        if settled:
+            if self._window_lost / settled > self.max_loss:
+                self._lossy_interval = self.interval
+                self._clean_windows = 0
+                self.interval = min(self.interval * self.backoff, self.max_interval)
+            else:
+                self._clean_windows += 1
+                if self._clean_windows >= self.probe_after:
+                    self._lossy_interval = 0.0  # Try faster again, the link may have recovered
+                floor = max(self.min_interval, self._lossy_interval * 1.05)
+                if self.latency is not None:
+                    floor = max(floor, self.latency / self.depth)
+                # A slow link may put the floor past max_interval, which is never exceeded
+                self.interval = max(self.interval * self.step, min(floor, self.max_interval))
+
+        self.window_start = now
+        self._window_answered = 0
+        self._window_lost = 0
+        self._window_latency = 0.0
+
+    def summary(self):
+        latency = f"{self.latency * 1000:.1f} ms" if self.latency is not None else "n/a"
+        return (f"{self.rate:.0f} samples/s | latency {latency} | interval {self.interval * 1000:.1f} ms | "
+                f"depth {self.depth} | sent {self.sent} | answered {self.answered} | lost {self.lost} | "
+                f"unmatched {self.unmatched}")
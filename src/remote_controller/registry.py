@@ -0,0 +1,55 @@
+import importlib
+from collections import namedtuple
+
+# module/class_name: where the driver lives, imported only when the model is selected
+# dependencies:      heavy third-party modules it pulls in (timed separately by --startup-profile)
+# background_reconnect: False for drivers that must stay on the main thread (pygame)
+DriverEntry = namedtuple('DriverEntry', 'module class_name dependencies background_reconnect')
+
+DRIVERS = {}
+
+
+def register(name, module, class_name, dependencies=(), background_reconnect=True):
+    DRIVERS[name] = DriverEntry(module, class_name, tuple(dependencies), background_reconnect)
+
+
+register('RC3',  'src.remote_controller.dji_rc3',  'DJIRC3',  dependencies=('pygame',), background_reconnect=False)
+register('N1',   'src.remote_controller.dji_rcN1', 'DJIRCN1', dependencies=('serial',))
+register('M300', 'src.remote_controller.dji_m300', 'DJIM300', dependencies=('serial',))
+
+
+def available_models():
+    return list(DRIVERS)
+
+
+def find_by_class(class_name):
+    """Registry entry of a driver class name, e.g. from a capture header."""
+    for entry in DRIVERS.values():
+        if entry.class_name == class_name:
+            return entry
+    return None
+
+
+def model_of_class(class_name):
+    """Registered model name of a driver class name, e.g. 'DJIRCN1' -> 'N1'."""
+    for name, entry in DRIVERS.items():
+        if entry.class_name == class_name:
+            return name
+    return None
+
+
+def load_driver(name, profile=None):
+    """Imports and returns the driver class of a registered model."""
+    entry = DRIVERS.get(name)
+    if entry is None:
+        raise ValueError(f"Unknown model '{name}', expected one of {available_models()}")
+
+    if profile is None:
+        return getattr(importlib.import_module(entry.module), entry.class_name)
+
+    for dependency in entry.dependencies:
+        with profile.measure(f"import {dependency}"):
+            importlib.import_module(dependency)
+    with profile.measure(f"import {entry.module}"):
+        module = importlib.import_module(entry.module)
+    return getattr(module, entry.class_name)
@@ -0,0 +1,110 @@
+import importlib
+import time
+from .base_rc import BaseRemoteController
+from .registry import find_by_class
+from .calibration import load_calibration
+from src.utils.capture import CaptureReader, KIND_DUML, KIND_SNAPSHOT, SNAPSHOT
+from src.utils.event_log import log
+
+buttons = [
+    ['button1', False],
+    ['button2', False],
+    ['button3', False],
+    ['button4', False],
+]
+
+class ReplayController(BaseRemoteController):
+    """
+    Feeds a capture file back through the normal update() interface.
+    realtime=True keeps the original timing, otherwise every update() consumes
+    the next sample as fast as it is called.
+    curves: response curves of serial captures, as the live driver was given.
+    """
+    def __init__(self, path, realtime=True, deadzone_threshold_movement=0.1, deadzone_threshold_elevation=0.1,
+                 curves=None):
+        super().__init__(buttons, deadzone_threshold_movement=deadzone_threshold_movement, deadzone_threshold_elevation=deadzone_threshold_elevation)
+
+        self.reader = CaptureReader(path)
+        self.realtime = realtime
+        self.finished = False
+        self.frames_replayed = 0
+
+        # The capture header names the driver class, only its module gets imported
+        # so replaying an N1 log doesn't need pygame and vice versa
+        entry = find_by_class(self.reader.model)
+        if entry is None:
+            raise ValueError(f"Capture was recorded from unknown model '{self.reader.model}'")
+        self._module = importlib.import_module(entry.module)
+        driver = getattr(self._module, self.reader.model)
+
+        # Serial captures decode with the model's own packet layout
+        # and the calibration the unit had when it was recorded
+        self._layout = getattr(driver, 'LAYOUT', None)
+        if self._layout is not None:
+            calibration = None
+            self.calibration_key = self.reader.calibration_key
+            if self.calibration_key:
+                calibration = load_calibration(self.calibration_key)
+                if calibration:
+                    log("Replaying with the calibration of {}", self.calibration_key)
+            self._decoder = self._layout.compile({
+                'movement': deadzone_threshold_movement,
+                'elevation': deadzone_threshold_elevation,
+            }, calibration, curves)
+
+        self._records = iter(self.reader)
+        self._pending = None  # Record read ahead but not due yet
+        self._start = None
+        print(f"Replaying {self.reader.model} capture from {path}")
+
+    def _next_record(self):
+        if self._pending is not None:
+            record, self._pending = self._pending, None
+            return record
+        return next(self._records, None)
+
+    def _apply(self, timestamp, kind, payload) -> bool:
+        """Returns True if the record produced a new sample."""
+        if kind == KIND_DUML:
+            if self._layout is not None and self._layout.matches(payload):
+                self.apply_sample(self._decoder.decode(payload))
+                return True
+        elif kind == KIND_SNAPSHOT:
+            *axes, button_mask = SNAPSHOT.unpack(payload)
+            self._module.apply_snapshot(self, axes, button_mask, timestamp)
+            return True
+        return False
+
+    def update(self):
+        if self.finished:
+            return False
+
+        if self._start is None:
+            self._start = time.perf_counter()
+        elapsed = time.perf_counter() - self._start
+
+        while True:
+            record = self._next_record()
+            if record is None:
+                self.finished = True
+                log("Replay finished: {} frames", self.frames_replayed)
+                return False
+
+            timestamp, kind, payload = record
+            if self.realtime and timestamp > elapsed:
+                self._pending = record
+                return True
+
+            if self._apply(timestamp, kind, payload):
+                self.frames_replayed += 1
+                if not self.realtime:
+                    return True
+
+    @property
+    def is_connected(self) -> bool:
+        return not self.finished
+
+    def close(self):
+        self._records = None
+        self._pending = None
+        self.reader.close()
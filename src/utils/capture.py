@@ -0,0 +1,135 @@
+import mmap
+import os
+import struct
+import time
+
+# --- Capture file format ---
+# Header: magic, format version, length-prefixed driver class name,
+#         length-prefixed calibration key (version 2, empty if the unit had none)
+# Records: (timestamp since capture start, kind, payload length) + payload
+MAGIC = b'DJRC'
+VERSION = 2
+READABLE_VERSIONS = (1, 2)
+HEADER = struct.Struct('<4sBB')
+KEY_LENGTH = struct.Struct('<B')
+RECORD = struct.Struct('<dBH')
+
+KIND_DUML = 1      # One complete DUML frame as received from the serial port
+KIND_SNAPSHOT = 2  # Raw joystick state (see SNAPSHOT)
+KIND_MARKER = 3    # UTF-8 label, e.g. the phases of a guided sniffer session
+
+# RC3 snapshot: 4 raw axes (before deadzone) + bitmask of the first 16 buttons
+SNAPSHOT = struct.Struct('<4fH')
+
+
+class CaptureWriter:
+    """
+    Appends raw controller frames with monotonic timestamps to a binary log.
+    calibration_key names the unit's stored calibration, so a replay decodes
+    with the same stick ranges as the live session.
+    """
+    def __init__(self, path, model, calibration_key=None):
+        self.path = path
+        self.model = model
+        self.calibration_key = calibration_key
+        self.records = 0
+        self._file = open(path, 'wb')
+        name = model.encode()
+        key = (calibration_key or '').encode()
+        self._file.write(HEADER.pack(MAGIC, VERSION, len(name)) + name + KEY_LENGTH.pack(len(key)) + key)
+        self._start = time.perf_counter()
+
+    def write(self, kind, payload):
+        self._file.write(RECORD.pack(time.perf_counter() - self._start, kind, len(payload)))
+        self._file.write(payload)
+        self.records += 1
+
+    def mark(self, label):
+        self.write(KIND_MARKER, label.encode())
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class CaptureReader:
+    """
+    Memory-mapped view of a capture file. Payloads are memoryviews into the map.
+    Raises ValueError for files that are not a complete capture header.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = self._view = None
+        try:
+            self._open()
+        except (OSError, ValueError):
+            self.close()
+            raise
+
+    def _open(self):
+        path = self.path
+        # mmap can't map an empty file, and a short one has no header to unpack
+        if os.fstat(self._file.fileno()).st_size < HEADER.size:
+            raise ValueError(f"{path} is too short to be a controller capture")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        end = len(self._map)
+
+        magic, version, name_len = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a controller capture")
+        if version not in READABLE_VERSIONS:
+            raise ValueError(f"{path}: unsupported capture version {version}")
+        offset = HEADER.size + name_len
+        if offset > end:
+            raise ValueError(f"{path}: capture header is truncated")
+        self.model = bytes(self._map[HEADER.size:offset]).decode()
+
+        self.calibration_key = None
+        if version >= 2:
+            if offset + KEY_LENGTH.size > end:
+                raise ValueError(f"{path}: capture header is truncated")
+            key_len, = KEY_LENGTH.unpack_from(self._map, offset)
+            offset += KEY_LENGTH.size
+            if offset + key_len > end:
+                raise ValueError(f"{path}: capture header is truncated")
+            self.calibration_key = bytes(self._map[offset:offset + key_len]).decode() or None
+            offset += key_len
+        self.data_start = offset
+
+    def records(self):
+        """Yields (timestamp, kind, payload offset, payload length) without slicing the map."""
+        unpack_from = RECORD.unpack_from
+        view = self._view
+        offset = self.data_start
+        end = len(view)
+        while offset + RECORD.size <= end:
+            timestamp, kind, length = unpack_from(view, offset)
+            offset += RECORD.size
+            if offset + length > end:
+                break
+            yield timestamp, kind, offset, length
+            offset += length
+
+    def __iter__(self):
+        """Yields (timestamp, kind, payload) for every record."""
+        view = self._view
+        unpack_from = RECORD.unpack_from
+        offset = self.data_start
+        end = len(view)
+        while offset + RECORD.size <= end:
+            timestamp, kind, length = unpack_from(view, offset)
+            offset += RECORD.size
+            if offset + length > end:
+                break  # Truncated last record, e.g. the capture was killed
+            yield timestamp, kind, view[offset:offset + length]
+            offset += length
+
+    def close(self):
+        if self._view is not None:
+            self._view.release()
+            self._map.close()
+            self._view = self._map = None
+        self._file.close()
@@ -0,0 +1,175 @@
+START_BYTE = 0x55
+HEADER_SIZE = 4     # 0x55, length/version (2 bytes), header CRC8
+MIN_FRAME_SIZE = 13 # header + src, dst, seq (2), type, cmdset, cmdid + CRC16
+MAX_FRAME_SIZE = 0x3FF
+
+
+def _build_crc8_table():
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x8C if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+_CRC8_TABLE = _build_crc8_table()
+
+
+def crc8(data, seed=0x77):
+    """DUML header checksum (reflected 0x8C polynomial, DJI seed)."""
+    crc = seed
+    for b in data:
+        crc = _CRC8_TABLE[crc ^ b]
+    return crc
+
+
+def _build_crc16_table():
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x8408 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+_CRC16_TABLE = _build_crc16_table()
+
+
+def crc16(data, seed=0x3692):
+    """DUML frame checksum (reflected 0x8408 polynomial, DJI seed), stored little-endian at the end."""
+    crc = seed
+    for b in data:
+        crc = (crc >> 8) ^ _CRC16_TABLE[(crc ^ b) & 0xFF]
+    return crc
+
+
+def build_frame(src, dst, seq, cmd_type, cmd_set, cmd_id, payload=b'', version=1):
+    """Assembles a complete DUML frame with both checksums."""
+    length = MIN_FRAME_SIZE + len(payload)
+    frame = bytearray(length)
+    frame[0] = START_BYTE
+    frame[1] = length & 0xFF
+    frame[2] = ((length >> 8) & 0x03) | (version << 2)
+    frame[3] = crc8(frame[0:3])
+    frame[4] = src
+    frame[5] = dst
+    frame[6] = seq & 0xFF
+    frame[7] = (seq >> 8) & 0xFF
+    frame[8] = cmd_type
+    frame[9] = cmd_set
+    frame[10] = cmd_id
+    frame[11:11 + len(payload)] = payload
+    crc = crc16(frame[:-2])
+    frame[-2] = crc & 0xFF
+    frame[-1] = crc >> 8
+    return bytes(frame)
+
+
+class DumlFramer:
+    """
+    Incremental DUML frame parser for the serial controllers.
+
+    Bytes are drained from the port in bulk into a preallocated bytearray and
+    complete frames are handed out as memoryviews into that buffer. A view is
+    only valid until the next call to feed()/write(), so decode it right away.
+
+    verify_crc also checks the CRC16 of every frame and drops corrupted ones.
+    """
+    def __init__(self, capacity=4096, verify_crc=False):
+        self.capacity = capacity
+        self.verify_crc = verify_crc
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._head = 0  # First unparsed byte
+        self._tail = 0  # One past the last received byte
+
+        # Diagnostics
+        self.frames_ok = 0
+        self.bytes_dropped = 0
+        self.crc_errors = 0
+
+    def __len__(self):
+        return self._tail - self._head
+
+    def reset(self):
+        self._head = 0
+        self._tail = 0
+
+    def feed(self, ser):
+        """Reads everything currently waiting on the port without blocking."""
+        waiting = ser.in_waiting
+        if not waiting:
+            return 0
+        data = ser.read(min(waiting, self.capacity))
+        self.write(data)
+        return len(data)
+
+    def write(self, data):
+        n = len(data)
+        if n > self.capacity:
+            # Only the newest bytes can ever form a frame we care about
+            self.bytes_dropped += n - self.capacity + (self._tail - self._head)
+            data = data[-self.capacity:]
+            n = self.capacity
+            self.reset()
+
+        if self._tail + n > self.capacity:
+            # Compact: move the unparsed bytes to the front of the buffer
+            pending = self._tail - self._head
+            if pending + n > self.capacity:
+                # Still no room, drop the oldest pending bytes
+                overflow = pending + n - self.capacity
+                self._head += overflow
+                self.bytes_dropped += overflow
+                pending -= overflow
+            self._buf[0:pending] = self._buf[self._head:self._tail]
+            self._head = 0
+            self._tail = pending
+
+        self._buf[self._tail:self._tail + n] = data
+        self._tail += n
+
+    def frames(self):
+        """Yields every complete frame currently in the buffer."""
+        buf = self._buf
+        while self._tail - self._head >= HEADER_SIZE:
+            head = self._head
+
+            # --- Resync on the start byte ---
+            if buf[head] != START_BYTE:
+                nxt = buf.find(b'\x55', head + 1, self._tail)
+                if nxt < 0:
+                    nxt = self._tail
+                self.bytes_dropped += nxt - head
+                self._head = nxt
+                continue
+
+            # --- Validate header ---
+            length = (buf[head + 1] | (buf[head + 2] << 8)) & MAX_FRAME_SIZE
+            if (length < MIN_FRAME_SIZE or length > self.capacity
+                    or crc8(self._view[head:head + 3]) != buf[head + 3]):
+                # False start byte, skip it and look for the next one
+                self.bytes_dropped += 1
+                self._head = head + 1
+                continue
+
+            # --- Wait for the rest of the frame ---
+            if self._tail - head < length:
+                break
+
+            if self.verify_crc:
+                end = head + length
+                if crc16(self._view[head:end - 2]) != buf[end - 2] | (buf[end - 1] << 8):
+                    # Corrupted body, the header may still be a false start so only skip the start byte
+                    self.crc_errors += 1
+                    self.bytes_dropped += 1
+                    self._head = head + 1
+                    continue
+
+            self._head = head + length
+            self.frames_ok += 1
+            yield self._view[head:head + length]
+
+        if self._head == self._tail:
+            self.reset()
@@ -0,0 +1,123 @@
+import itertools
+import sys
+import threading
+import time
+
+DROP_NEW = 'drop_new'  # Full buffer: discard the record being logged
+DROP_OLD = 'drop_old'  # Full buffer: overwrite the oldest unwritten record
+
+
+class EventLog:
+    """
+    Logging for the control loop that never blocks on the console.
+
+    log() only stores (seq, timestamp, template, args) into a preallocated
+    ring; a background thread formats the records with str.format and writes
+    them in batches. When the writer can't keep up, records are dropped
+    according to drop_policy and counted in `dropped`.
+    """
+    def __init__(self, capacity=4096, drop_policy=DROP_NEW, stream=None, interval=0.02, timestamps=False):
+        if drop_policy not in (DROP_NEW, DROP_OLD):
+            raise ValueError(f"Unknown drop policy '{drop_policy}'")
+        self.capacity = capacity
+        self.drop_policy = drop_policy
+        self.stream = stream
+        self.interval = interval
+        self.timestamps = timestamps
+
+        self._slots = [None] * capacity
+        self._claim = itertools.count()  # next() is atomic, so several threads may log
+        self._claimed = 0                # Approximate, only used for the DROP_NEW check
+        self._read = 0                   # Next sequence number the writer expects
+        self.dropped = 0
+        self.written = 0
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_time = time.perf_counter()
+
+    def log(self, template, *args):
+        if self._thread is None:
+            self.start()
+        if self.drop_policy == DROP_NEW and self._claimed - self._read >= self.capacity:
+            self.dropped += 1
+            return
+        seq = next(self._claim)
+        self._claimed = seq + 1
+        self._slots[seq % self.capacity] = (seq, time.perf_counter(), template, args)
+
+    # --- Writer side ---
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="EventLog", daemon=True)
+        self._thread.start()
+
+    def _format(self, timestamp, template, args):
+        try:
+            text = template.format(*args) if args else template
+        except Exception as e:
+            text = f"{template} {args} <format error: {e}>"
+        if self.timestamps:
+            return f"[{timestamp - self._start_time:10.4f}] {text}"
+        return text
+
+    def drain(self):
+        """Formats and writes everything logged so far. Returns the number of records written."""
+        slots = self._slots
+        capacity = self.capacity
+        lines = []
+        while True:
+            record = slots[self._read % capacity]
+            if record is None or record[0] < self._read:
+                break  # Not written yet
+            if record[0] > self._read:
+                # The producer lapped us (DROP_OLD), resume at the oldest record still in the ring
+                oldest = max(self._read + 1, self._claimed - capacity)
+                self.dropped += oldest - self._read
+                self._read = oldest
+                continue
+            lines.append(self._format(record[1], record[2], record[3]))
+            self._read += 1
+
+        if lines:
+            stream = self.stream or sys.stdout
+            stream.write('\n'.join(lines) + '\n')
+            stream.flush()
+            self.written += len(lines)
+        return len(lines)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.drain()
+        self.drain()
+
+    def close(self):
+        """Stops the writer after flushing what is left."""
+        if self._thread is None:
+            self.drain()
+            return
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+
+# --- Shared default log ---
+_default = EventLog()
+
+
+def configure(**kwargs):
+    """Replaces the shared log, e.g. configure(drop_policy=DROP_OLD). Call before the loop starts."""
+    global _default
+    _default.close()
+    _default = EventLog(**kwargs)
+    return _default
+
+
+def get_log():
+    return _default
+
+
+def log(template, *args):
+    _default.log(template, *args)
@@ -0,0 +1,157 @@
+import math
+
+SMOOTHING = (None, 'ema', 'one_euro')
+
+
+def _key_events(old, new):
+    """Key presses/releases a sign change costs: 0->1 is a press, 1->-1 a release and a press."""
+    if old == new:
+        return 0
+    return (old != 0) + (new != 0)
+
+
+class AxisFilter:
+    """
+    Per-axis stage between decode and key output.
+
+    enter/exit: hysteresis deadzone. The axis leaves 0 once |value| >= enter
+                and only returns to 0 when |value| < exit (exit <= enter).
+    smoothing:  None, 'ema' (alpha) or 'one_euro' (min_cutoff, beta, d_cutoff),
+                applied before the thresholds.
+    dwell:      minimum seconds the output sign stays the same before it may change.
+
+    The filter also runs a plain |value| >= enter threshold on the raw input
+    to count how many key events it saved (naive_events - key_events).
+    """
+    __slots__ = ('enter', 'exit', 'smoothing', 'alpha', 'min_cutoff', 'beta', 'd_cutoff', 'dwell',
+                 'state', 'changed_at', 'value', 'naive_state', 'key_events', 'naive_events',
+                 '_last_time', '_last_raw', '_dx')
+
+    def __init__(self, enter=0.1, exit=None, smoothing=None, alpha=0.5,
+                 min_cutoff=1.0, beta=0.05, d_cutoff=1.0, dwell=0.0):
+        if smoothing not in SMOOTHING:
+            raise ValueError(f"Unknown smoothing '{smoothing}', expected one of {SMOOTHING}")
+        self.enter = enter
+        self.exit = enter if exit is None else min(exit, enter)
+        self.smoothing = smoothing
+        self.alpha = alpha
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.dwell = dwell
+        self.reset()
+
+    def reset(self):
+        self.state = 0           # Output sign: -1, 0, 1
+        self.changed_at = float('-inf')
+        self.value = 0.0         # Smoothed value
+        self.naive_state = 0
+        self.key_events = 0
+        self.naive_events = 0
+        self._last_time = None
+        self._last_raw = 0.0
+        self._dx = 0.0
+
+    @property
+    def suppressed(self):
+        return max(0, self.naive_events - self.key_events)
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def _smooth(self, raw, now):
+        last_time = self._last_time
+        self._last_time = now
+        if self.smoothing is None:
+            return raw
+        if last_time is None:
+            self._last_raw = raw
+            return raw
+
+        if self.smoothing == 'ema':
+            return self.value + self.alpha * (raw - self.value)
+
+        # One-euro: the cutoff rises with the speed of the stick, so slow
+        # movements are smoothed hard and fast ones keep their latency
+        dt = now - last_time
+        if dt <= 0:
+            return self.value
+        dx = (raw - self._last_raw) / dt
+        self._last_raw = raw
+        self._dx += self._alpha(self.d_cutoff, dt) * (dx - self._dx)
+        cutoff = self.min_cutoff + self.beta * abs(self._dx)
+        return self.value + self._alpha(cutoff, dt) * (raw - self.value)
+
+    def __call__(self, raw, now):
+        naive = (1 if raw > 0 else -1) if abs(raw) >= self.enter else 0
+        if naive != self.naive_state:
+            self.naive_events += _key_events(self.naive_state, naive)
+            self.naive_state = naive
+
+        value = self.value = self._smooth(raw, now)
+        state = self.state
+        if state and value * state >= self.exit:
+            target = state
+        else:
+            target = (1 if value > 0 else -1) if abs(value) >= self.enter else 0
+
+        if target != state and now - self.changed_at >= self.dwell:
+            self.key_events += _key_events(state, target)
+            self.state = state = target
+            self.changed_at = now
+
+        if not state:
+            return 0.0
+        # Held by the dwell time with the stick already back: keep the key down
+        return value if value * state > 0 else state * max(self.exit, 0.01)
+
+
+class FilterBank:
+    """One optional AxisFilter per value slot. apply() filters a frame's value list in place."""
+    def __init__(self, filters):
+        self.filters = tuple(filters)
+        self._active = tuple((slot, f) for slot, f in enumerate(self.filters) if f is not None)
+
+    def apply(self, values, now):
+        for slot, axis_filter in self._active:
+            values[slot] = axis_filter(values[slot], now)
+
+    @property
+    def suppressed(self):
+        return sum(f.suppressed for _, f in self._active)
+
+    @property
+    def key_events(self):
+        return sum(f.key_events for _, f in self._active)
+
+    def reset(self):
+        for _, axis_filter in self._active:
+            axis_filter.reset()
+
+
+def build_filters(sources, movement, elevation, smoothing=None, dwell=0.03, exit_ratio=0.75, overrides=None):
+    """
+    FilterBank for the value slots named in `sources` (e.g. mapping.SOURCES).
+    Throttle uses the elevation deadzone as its enter threshold, every other
+    axis the movement one; exit is enter * exit_ratio.
+    overrides: {source: AxisFilter kwargs}, e.g. from the "filters" section of a profile file.
+                None as the value disables the filter of that axis.
+    """
+    overrides = overrides or {}
+    unknown = set(overrides) - set(sources)
+    if unknown:
+        raise ValueError(f"Filters for unknown axes {sorted(unknown)}, expected some of {list(sources)}")
+
+    filters = []
+    for source in sources:
+        enter = elevation if source == 'throttle' else movement
+        options = dict(enter=enter, exit=enter * exit_ratio, smoothing=smoothing, dwell=dwell)
+        if source in overrides:
+            if overrides[source] is None:
+                filters.append(None)
+                continue
+            options.update(overrides[source])
+        filters.append(AxisFilter(**options))
+    return FilterBank(filters)
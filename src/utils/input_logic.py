@@ -1,54 +1,199 @@
 import time
+from src.utils.event_log import log
 
-class ButtonHandler:
-    def __init__(self, button_name, long_threshold=1.0, print_update=False):
-        self.button_name = button_name
+
+def _bits(mask):
+    """Yields the index of every set bit, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class ButtonBank:
+    """
+    State of all of a controller's buttons, updated from one bitmask per frame.
+
+    Bit i of every mask is button i. After update(mask, now):
+      pressed      - buttons currently down
+      pressed_edge - went down this frame
+      released_edge- went up this frame
+      taps         - released before long_threshold (one-shot)
+      long_presses - crossed long_threshold this frame (one-shot)
+      held_long    - down and past long_threshold (maintained)
+
+    The per-frame work is a handful of integer operations plus a loop over the
+    buttons that are held but haven't reached long_threshold yet.
+    """
+    __slots__ = ('names', 'long_threshold', 'print_mask', 'all_mask',
+                 'pressed', 'pressed_edge', 'released_edge', 'taps', 'long_presses', 'held_long',
+                 'now', '_latched', '_press_times')
+
+    def __init__(self, names, long_threshold=1.0, print_mask=0):
+        self.names = tuple(names)
         self.long_threshold = long_threshold
-        self.print_update = print_update
-
-        self.last_state = False
-        self.start_time = 0
-        self.long_press_triggered = False  # The latch
-
-        self.is_pressed = False
-        self.is_short_tap = False
-        self.is_long_press = False
-        self.is_maintained_long_press = False
-
-    def update(self, current_val: bool):
-        current_time = time.time()
-        self.is_pressed = current_val
-        self.is_short_tap = False
-        self.is_long_press = False
-        # Note: We don't reset is_maintained_long_press to False here yet 
-        # because we need to calculate its state based on current_val
-
-        if current_val:  # Button is DOWN
-            if not self.last_state:  # First frame of press
-                self.start_time = current_time
-                self.long_press_triggered = False 
-            
-            # Check for Long Press
-            if current_time - self.start_time >= self.long_threshold:
-                # 1. Maintained state: Always True once threshold is crossed
-                self.is_maintained_long_press = True
-                
-                # 2. One-shot state: Only True on the exact frame it crosses
-                if not self.long_press_triggered:
-                    self.is_long_press = True
-                    self.long_press_triggered = True
-        else:  # Button is UP
-            if self.last_state:  # Just released
-                if not self.long_press_triggered:
-                    self.is_short_tap = True
-                
-                self.start_time = 0
-                self.long_press_triggered = False
-            
-            # Reset maintained state when button is released
-            self.is_maintained_long_press = False
-
-        self.last_state = current_val
-
-        if self.print_update:
-            print(f'{self.button_name} - is_pressed: {self.is_pressed} | is_short_tap: {self.is_short_tap} | is_long_press: {self.is_long_press} | is_maintained_long_press: {self.is_maintained_long_press}')
\ No newline at end of file
+        self.print_mask = print_mask
+        self.all_mask = (1 << len(self.names)) - 1
+
+        self.pressed = 0
+        self.pressed_edge = 0
+        self.released_edge = 0
+        self.taps = 0
+        self.long_presses = 0
+        self.held_long = 0
+        self.now = 0.0
+
+        self._latched = 0  # Buttons whose long press already fired during this hold
+        self._press_times = [0.0] * len(self.names)
+
+    def bit(self, name):
+        return 1 << self.names.index(name)
+
+    def update(self, mask, now=None):
+        if now is None:
+            now = time.monotonic()
+        self.now = now
+        mask &= self.all_mask
+
+        previous = self.pressed
+        rising = mask & ~previous
+        falling = previous & ~mask
+
+        press_times = self._press_times
+        for i in _bits(rising):
+            press_times[i] = now
+
+        # Only buttons that are held and not latched yet can turn into a long press
+        long_presses = 0
+        threshold = self.long_threshold
+        for i in _bits(mask & ~self._latched):
+            if now - press_times[i] >= threshold:
+                long_presses |= 1 << i
+
+        self.taps = falling & ~self._latched
+        self._latched = (self._latched & mask) | long_presses
+        self.long_presses = long_presses
+        self.held_long = self._latched
+        self.pressed = mask
+        self.pressed_edge = rising
+        self.released_edge = falling
+
+        changed = self.print_mask & (rising | falling | long_presses)
+        if changed:
+            for i in _bits(changed):
+                bit = 1 << i
+                log('{} - is_pressed: {} | is_short_tap: {} | is_long_press: {} | is_maintained_long_press: {}',
+                    self.names[i], bool(mask & bit), bool(self.taps & bit),
+                    bool(long_presses & bit), bool(self.held_long & bit))
+
+    def reset(self):
+        self.pressed = self.pressed_edge = self.released_edge = 0
+        self.taps = self.long_presses = self.held_long = self._latched = 0
+
+    def view(self, index):
+        return ButtonView(self, index)
+
+
+class ButtonView:
+    """Single-button read-only view of a ButtonBank, keeps the old per-button attributes."""
+    __slots__ = ('bank', 'bit', 'button_name')
+
+    def __init__(self, bank, index):
+        self.bank = bank
+        self.bit = 1 << index
+        self.button_name = bank.names[index]
+
+    @property
+    def is_pressed(self):
+        return bool(self.bank.pressed & self.bit)
+
+    @property
+    def is_short_tap(self):
+        return bool(self.bank.taps & self.bit)
+
+    @property
+    def is_long_press(self):
+        return bool(self.bank.long_presses & self.bit)
+
+    @property
+    def is_maintained_long_press(self):
+        return bool(self.bank.held_long & self.bit)
+
+    def __int__(self):
+        return int(self.is_pressed)
+
+
+# --- Gestures ---
+# Events a gesture can be triggered by, each reads one ButtonBank mask
+ON_PRESS = 'pressed_edge'
+ON_TAP = 'taps'
+
+
+class GestureRecognizer:
+    """
+    Table-driven double-taps and chords on top of a ButtonBank.
+
+    Every gesture is a row (trigger event, trigger button, required held
+    buttons, required long-held buttons, double-tap window). Rows are indexed
+    by (event, button), so a frame without button edges costs two integer
+    checks and a frame with edges only looks at the rows of the buttons that
+    changed, however many gestures are configured.
+
+    update(bank) sets `fired`, a bitmask of gesture ids; test it with
+    fired & recognizer.id('name').
+    """
+    __slots__ = ('names', 'fired', '_rows', '_last_tap')
+
+    def __init__(self):
+        self.names = []
+        self.fired = 0
+        self._rows = {ON_PRESS: {}, ON_TAP: {}}
+        self._last_tap = {}  # button index -> time of the previous tap
+
+    def id(self, name):
+        return 1 << self.names.index(name)
+
+    def _add(self, name, event, trigger_mask, held=0, held_long=0, window=0.0):
+        if name in self.names:
+            raise ValueError(f"Gesture '{name}' is already defined")
+        gesture = 1 << len(self.names)
+        self.names.append(name)
+        for i in _bits(trigger_mask):
+            self._rows[event].setdefault(i, []).append((gesture, held, held_long, window))
+        return gesture
+
+    def add_chord(self, name, mask):
+        """Fires on the frame the last button of `mask` goes down while the others are held."""
+        return self._add(name, ON_PRESS, mask, held=mask)
+
+    def add_double_tap(self, name, mask, window=0.35):
+        """Fires on the second tap of a button in `mask` within `window` seconds of the first."""
+        return self._add(name, ON_TAP, mask, window=window)
+
+    def add_hold_tap(self, name, hold_mask, tap_mask):
+        """Fires when a button in `tap_mask` is tapped while every button in `hold_mask` is long-held."""
+        return self._add(name, ON_TAP, tap_mask, held_long=hold_mask)
+
+    def update(self, bank):
+        fired = 0
+        for event, rows in self._rows.items():
+            events = getattr(bank, event)
+            if not events or not rows:
+                continue
+            for i in _bits(events):
+                previous_tap = None
+                if event == ON_TAP:
+                    previous_tap = self._last_tap.get(i)
+                    self._last_tap[i] = bank.now
+                for gesture, held, held_long, window in rows.get(i, ()):
+                    if held and bank.pressed & held != held:
+                        continue
+                    if held_long and bank.held_long & held_long != held_long:
+                        continue
+                    if window:
+                        if previous_tap is None or bank.now - previous_tap > window:
+                            continue
+                        self._last_tap.pop(i, None)  # A third tap starts a new pair
+                    fired |= gesture
+        self.fired = fired
+        return fired
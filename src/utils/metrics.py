@@ -0,0 +1,146 @@
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Bucket upper bounds in nanoseconds: 1us .. 100ms, roughly 1-2-5 steps
+BUCKET_BOUNDS_NS = (
+    1_000, 2_000, 5_000, 10_000, 20_000, 50_000, 100_000, 200_000, 500_000,
+    1_000_000, 2_000_000, 5_000_000, 10_000_000, 20_000_000, 50_000_000, 100_000_000,
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram. observe() does one bisect and three additions."""
+    __slots__ = ('counts', 'count', 'total_ns', 'max_ns')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_NS) + 1)  # Last bucket is +Inf
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def observe(self, ns):
+        self.counts[bisect_left(BUCKET_BOUNDS_NS, ns)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, q):
+        """Upper bound (ns) of the bucket holding the q-th percentile."""
+        if not self.count:
+            return 0
+        target = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            cumulative += n
+            if cumulative >= target:
+                return min(BUCKET_BOUNDS_NS[i], self.max_ns) if i < len(BUCKET_BOUNDS_NS) else self.max_ns
+        return self.max_ns
+
+
+class Metrics:
+    """
+    Per-stage timing of the control loop.
+
+    Call begin() at the start of an iteration and lap('stage') after each
+    stage; the time since the previous mark goes into that stage's histogram.
+    Counters are plain ints, gauges are callables read only at export time.
+    """
+    def __init__(self, stages=(), counters=()):
+        self.clock = time.perf_counter_ns
+        self.stages = {name: Histogram() for name in stages}
+        self.counters = {name: 0 for name in counters}
+        self.gauges = {}
+        self._mark = 0
+
+    def begin(self):
+        self._mark = self.clock()
+
+    def lap(self, stage):
+        now = self.clock()
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = Histogram()
+        histogram.observe(now - self._mark)
+        self._mark = now
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, read):
+        """Registers a value owned elsewhere, e.g. lambda: scheduler.overruns."""
+        self.gauges[name] = read
+
+    # --- Reporting ---
+    def summary(self):
+        parts = []
+        for name, h in self.stages.items():
+            parts.append(f"{name}: p50 {h.percentile(0.5) / 1000:.0f}us p99 {h.percentile(0.99) / 1000:.0f}us "
+                         f"max {h.max_ns / 1000:.0f}us")
+        values = dict(self.counters)
+        values.update({name: read() for name, read in self.gauges.items()})
+        parts.append(' '.join(f"{name}={value}" for name, value in values.items()))
+        return ' | '.join(parts)
+
+    def openmetrics(self, prefix='dji_rc'):
+        lines = [f"# TYPE {prefix}_stage_seconds histogram",
+                 f"# UNIT {prefix}_stage_seconds seconds"]
+        for name, h in self.stages.items():
+            cumulative = 0
+            for bound, n in zip(BUCKET_BOUNDS_NS, h.counts):
+                cumulative += n
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="{bound / 1e9:g}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {h.count}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {h.total_ns / 1e9:.9f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {h.count}')
+
+        for name, value in self.counters.items():
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        for name, read in self.gauges.items():
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {read()}")
+
+        lines.append("# EOF")
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port=9464, host='127.0.0.1'):
+        """Serves openmetrics() on http://host:port/metrics from a daemon thread."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.openmetrics().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/openmetrics-text; version=1.0.0; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep the console for the control loop
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="MetricsServer", daemon=True).start()
+        print(f"Metrics on http://{host}:{port}/metrics")
+        return server
+
+
+class NullMetrics:
+    """Drop-in for Metrics when instrumentation is off, every call is a no-op."""
+    def begin(self):
+        pass
+
+    def lap(self, stage):
+        pass
+
+    def count(self, name, n=1):
+        pass
+
+    def gauge(self, name, read):
+        pass
@@ -0,0 +1,79 @@
+import time
+
+class FrameScheduler:
+    """
+    Fixed-rate loop pacing using absolute monotonic deadlines.
+
+    Unlike sleeping a fixed amount after the work, the deadline of frame N is
+    start + N * period, so the rate does not drift with the time the loop body
+    takes. With spin_threshold > 0 the last part of every wait is a busy-wait,
+    which trades some CPU for sub-millisecond precision on coarse OS timers.
+    """
+    def __init__(self, rate_hz=100, spin_threshold=0.0):
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.spin_threshold = spin_threshold
+
+        self.next_deadline = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.frames = 0
+        self.overruns = 0        # Frames whose work ran past their deadline
+        self.skipped = 0         # Whole periods dropped to catch up after an overrun
+        self.min_headroom = None # Smallest time left before a deadline (seconds)
+        self.total_headroom = 0.0
+
+    def start(self):
+        """(Re)anchors the deadlines to now, e.g. after a deliberate pause."""
+        self.next_deadline = time.perf_counter() + self.period
+
+    def wait(self) -> bool:
+        """
+        Blocks until the next frame deadline.
+        Returns: False if the previous frame overran its deadline, True otherwise.
+        """
+        if self.next_deadline is None:
+            self.start()
+            return True
+
+        now = time.perf_counter()
+        headroom = self.next_deadline - now
+        self.frames += 1
+
+        if headroom < 0:
+            self.overruns += 1
+            # If we fell behind by more than a period, skip the missed frames
+            # instead of bursting through them back to back.
+            missed = int(-headroom / self.period)
+            if missed:
+                self.skipped += missed
+                self.next_deadline += missed * self.period
+            self.next_deadline += self.period
+            return False
+
+        if self.min_headroom is None or headroom < self.min_headroom:
+            self.min_headroom = headroom
+        self.total_headroom += headroom
+
+        # --- Hybrid wait: coarse sleep, then spin for the remainder ---
+        sleep_time = headroom - self.spin_threshold
+        if sleep_time > 0:
+            time.sleep(sleep_time)
+        if self.spin_threshold > 0:
+            while time.perf_counter() < self.next_deadline:
+                pass
+
+        self.next_deadline += self.period
+        return True
+
+    @property
+    def avg_headroom(self):
+        on_time = self.frames - self.overruns
+        return self.total_headroom / on_time if on_time else 0.0
+
+    def summary(self):
+        min_headroom = (self.min_headroom or 0.0) * 1000
+        return (f"{self.rate_hz} Hz | frames: {self.frames} | overruns: {self.overruns} | "
+                f"skipped: {self.skipped} | headroom avg: {self.avg_headroom * 1000:.2f} ms "
+                f"min: {min_headroom:.2f} ms")
@@ -1,63 +1,198 @@
+import json
 import time
+from bisect import bisect_right
+from src.utils.event_log import log
+
+# Easing curves for ramped steps, t goes 0 -> 1 over the step
+EASINGS = {
+    'linear':      lambda t: t,
+    'ease_in':     lambda t: t * t,
+    'ease_out':    lambda t: 1.0 - (1.0 - t) * (1.0 - t),
+    'ease_in_out': lambda t: t * t * (3.0 - 2.0 * t),
+}
 
 class SequenceStep:
-    def __init__(self, duration, axes_map):
+    def __init__(self, duration, axes_map, ramp=None):
         """
         duration: Seconds to run this step
         axes_map: Dict, e.g., {KbAxis.PITCH: 0.5, KbAxis.YAW: 0.2}
+        ramp:     None holds the values for the whole step, or a name from EASINGS
+                  to move from the previous step's values to these over the step
         """
+        if ramp is not None and ramp not in EASINGS:
+            raise ValueError(f"Unknown ramp '{ramp}', expected one of {list(EASINGS)}")
         self.duration = duration
         self.axes_map = axes_map
+        self.ramp = ramp
+
+
+class CompiledStep:
+    """
+    A step with everything update() needs precomputed.
+    keys is stable for the whole step, so callers can compile it once
+    (e.g. MappingProgram.compile_overrides) and reuse it every frame.
+    """
+    __slots__ = ('index', 'start', 'duration', 'keys', 'start_values', 'end_values', 'ease')
+
+    def __init__(self, index, start, step, previous_values):
+        self.index = index
+        self.start = start
+        self.duration = step.duration
+        self.keys = tuple(step.axes_map)
+        self.end_values = tuple(step.axes_map.values())
+        self.ease = EASINGS[step.ramp] if step.ramp else None
+
+        # Ramps start where the previous step left the axis, a centered stick if it
+        # didn't set it. Non-numeric values (button flags) never ramp.
+        start_values = []
+        for key, value in step.axes_map.items():
+            if self.ease and not isinstance(value, bool) and isinstance(value, (int, float)):
+                start_values.append(previous_values.get(key, 0.0))
+            else:
+                start_values.append(value)
+        self.start_values = tuple(start_values)
+
+    def values_at(self, elapsed):
+        if self.ease is None:
+            return self.end_values
+        t = (elapsed - self.start) / self.duration if self.duration > 0 else 1.0
+        e = self.ease(min(max(t, 0.0), 1.0))
+        return tuple(a if a is b else a + (b - a) * e for a, b in zip(self.start_values, self.end_values))
+
+
+class Timeline:
+    """
+    A sequence compiled to cumulative step boundaries.
+
+    loop: False/0 plays once, True forever, an int that many times.
+    step_at() finds the active step with a bisect over the boundaries, so a
+    mission with thousands of steps costs the same per frame as three.
+    """
+    def __init__(self, steps, loop=False, name=None):
+        if not steps:
+            raise ValueError("A sequence needs at least one step")
+        self.name = name
+        self.loop = loop
 
-class SequenceHandler:
-    def __init__(self):
         self.steps = []
+        self.ends = []  # Cumulative end time of every step
+        elapsed = 0.0
+        values = {}     # Axis values at the end of the previous step
+        for index, step in enumerate(steps):
+            compiled = CompiledStep(index, elapsed, step, values)
+            self.steps.append(compiled)
+            elapsed += step.duration
+            self.ends.append(elapsed)
+            values.update(step.axes_map)
+        self.duration = elapsed
+
+    @property
+    def total_duration(self):
+        """Length including repetitions, None when looping forever."""
+        if self.loop is True:
+            return None
+        return self.duration * max(int(self.loop), 1)
+
+    def step_at(self, elapsed, hint=None):
+        """
+        Active step at `elapsed` seconds since start, None once finished.
+        hint: the step returned last frame, checked first so the bisect only runs on step changes.
+        """
+        total = self.total_duration
+        if self.duration <= 0 or (total is not None and elapsed >= total):
+            return None
+        local = self.local_time(elapsed)
+
+        if hint is not None and hint.start <= local < hint.start + hint.duration:
+            return hint
+        index = bisect_right(self.ends, local)
+        return self.steps[min(index, len(self.steps) - 1)]
+
+    def local_time(self, elapsed):
+        """Time inside the current repetition."""
+        return elapsed % self.duration if elapsed >= self.duration else elapsed
+
+
+class SequenceHandler:
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.timeline = None
         self.active = False
-        self.current_step_idx = 0
-        self.step_start_time = 0
+        self.current = None  # CompiledStep of the last update()
+        self.start_time = 0
 
-    def start_sequence(self, steps_list):
-        if not steps_list:
+    def start_sequence(self, sequence, loop=False):
+        """sequence: a Timeline, or a list of SequenceStep compiled on the spot."""
+        if not sequence:
             return
-        self.steps = steps_list
-        self.current_step_idx = 0
-        self.step_start_time = time.time()
+        if not isinstance(sequence, Timeline):
+            sequence = Timeline(sequence, loop=loop)
+        self.timeline = sequence
+        self.current = None
+        self.start_time = self.clock()
         self.active = True
-        print(f">>> SEQUENCE STARTED: {len(self.steps)} steps loaded.")
+        log(">>> SEQUENCE STARTED: {} steps loaded.", len(sequence.steps))
 
     def stop(self):
         if self.active:
-            print(">>> SEQUENCE TERMINATED <<<")
+            log(">>> SEQUENCE TERMINATED <<<")
         self.active = False
-        self.steps = []
+        self.timeline = None
+        self.current = None
 
     def update(self):
         """
-        Returns: (axes_to_override_dict, is_running)
+        Returns: (step, values, is_running)
+            step:   CompiledStep, None when nothing is running. step.keys names the overridden axes/buttons.
+            values: their values for this frame, same order as step.keys
         """
-        # 1. Check if we are active and within bounds
-        if not self.active or self.current_step_idx >= len(self.steps):
-            if self.active: # If we were active but just hit the end
-                print(">>> SEQUENCE FINISHED <<<")
-                self.active = False
-            return {}, False
-
-        current_step = self.steps[self.current_step_idx]
-        elapsed = time.time() - self.step_start_time
-
-        # 2. Check if current step is finished
-        if elapsed >= current_step.duration:
-            self.current_step_idx += 1
-            self.step_start_time = time.time()
-            
-            # Check if there's actually another step coming
-            if self.current_step_idx < len(self.steps):
-                print(f">>> STEP {self.current_step_idx + 1}/{len(self.steps)}")
-                # Recurse to immediately start the next step's logic
-                return self.update()
-            else:
-                print(">>> SEQUENCE FINISHED <<<")
-                self.active = False
-                return {}, False
+        if not self.active:
+            return None, (), False
+
+        elapsed = self.clock() - self.start_time
+        timeline = self.timeline
+        step = timeline.step_at(elapsed, self.current)
+        if step is None:
+            log(">>> SEQUENCE FINISHED <<<")
+            self.active = False
+            self.timeline = None
+            self.current = None
+            return None, (), False
+
+        if step is not self.current:
+            if self.current is not None:
+                log(">>> STEP {}/{}", step.index + 1, len(timeline.steps))
+            self.current = step
+        return step, step.values_at(timeline.local_time(elapsed)), True
+
+
+# --- Sequence files ---
+def load_sequences(path):
+    """
+    Reads named sequences from a JSON file:
+        {"sequences": {"name": {"loop": false, "steps": [
+            {"duration": 3.0, "axes": {"PITCH": 1.0}, "ramp": "ease_in_out"},
+            {"duration": 0.1, "buttons": ["PAUSE"]}]}}}
+    Returns: dict name -> Timeline
+    """
+    from src.keyboard.keyboard import KbAxis, KbButton
+
+    with open(path) as f:
+        config = json.load(f)
 
-        return current_step.axes_map, True
\ No newline at end of file
+    timelines = {}
+    for name, sequence in config.get('sequences', {}).items():
+        steps = []
+        for raw in sequence.get('steps', ()):
+            axes_map = {}
+            for axis, value in raw.get('axes', {}).items():
+                if axis not in KbAxis.__members__:
+                    raise ValueError(f"Sequence '{name}': unknown axis '{axis}'")
+                axes_map[KbAxis[axis]] = float(value)
+            for button in raw.get('buttons', ()):
+                if button not in KbButton.__members__:
+                    raise ValueError(f"Sequence '{name}': unknown button '{button}'")
+                axes_map[KbButton[button]] = True
+            steps.append(SequenceStep(raw['duration'], axes_map, ramp=raw.get('ramp')))
+        timelines[name] = Timeline(steps, loop=sequence.get('loop', False), name=name)
+    return timelines
@@ -0,0 +1,245 @@
+"""
+Pseudo-terminal DUML controller simulator (Linux/macOS).
+
+Opens a pty pair and behaves like an N1/M300 on its serial port: it answers
+the simulator-enable and stick-request packets the drivers send and can
+stream stick frames on its own at up to 1 kHz, with optional corruption,
+truncated frames and interleaved 14/77-byte status packets. --latency delays
+every reply and --reply-rate drops requests beyond what a slow unit answers,
+to exercise the drivers' request pipeline.
+
+    python -m src.utils.simulator --rate 1000 --stream --corrupt 0.01 --partial 0.01 --status
+    python main.py --model N1 --port /dev/pts/N
+
+Stick replies follow the PacketLayout of the simulated model's driver (--model).
+"""
+import argparse
+import os
+import random
+import select
+import struct
+from collections import deque
+import threading
+import time
+import tty
+
+from src.utils.duml import DumlFramer, build_frame, MIN_FRAME_SIZE
+from src.remote_controller.base_rc import SAMPLE_AXES
+from src.remote_controller.registry import DRIVERS, load_driver
+
+# DUML addressing used by the drivers (simulator command set 0x06)
+CMD_SET_SIM = 0x06
+CMD_ENABLE = 0x24
+CMD_STICKS = 0x01
+TYPE_REPLY = 0x80
+
+PAYLOAD_OFFSET = 11  # Frame byte of the first payload byte
+CRC_SIZE = 2
+
+STATUS_SIZES = (14, 77)  # Status packets seen in sniffer captures
+
+
+class DumlSimulator:
+    """
+    model: registered model whose driver LAYOUT places the sticks in the replies.
+    script: optional list of (duration, (roll, pitch, throttle, yaw, tilt)) with
+            normalized values, played in a loop. Without it the sticks random-walk.
+    latency: seconds between a request and its reply.
+    reply_rate: most stick requests answered per second, the others are ignored.
+    """
+    def __init__(self, rate_hz=100, stream=False, script=None, corrupt=0.0, partial=0.0,
+                 status=False, device_address=0x06, seed=None, latency=0.0, reply_rate=None, model='N1'):
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.stream = stream
+        self.script = script
+        self.corrupt = corrupt
+        self.partial = partial
+        self.status = status
+        self.device_address = device_address
+        self.latency = latency
+        self.reply_rate = reply_rate
+        self.rng = random.Random(seed)
+
+        # Replies are long enough for every axis, the layout's frame size at least
+        layout = load_driver(model).LAYOUT
+        self.layout = layout
+        self.payload_size = max(layout.frame_size, layout.struct.size + CRC_SIZE) - MIN_FRAME_SIZE
+        self._fields = [(SAMPLE_AXES.index(field.name), struct.Struct('<' + field.fmt),
+                         field.offset - PAYLOAD_OFFSET, field) for field in layout.axes]
+
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)  # No echo/line discipline, bytes pass untouched
+        self.port = os.ttyname(self.slave)
+
+        self.framer = DumlFramer()
+        self.sticks = [0.0] * 5
+        self._seq = 0
+        self._script_start = None
+        self._replies = deque()  # (due time, frame) waiting for the latency
+        self._next_reply = 0.0
+
+        # Stats
+        self.enabled = False
+        self.requests_seen = 0
+        self.frames_sent = 0
+        self.corrupted = 0
+        self.truncated = 0
+        self.status_sent = 0
+        self.requests_ignored = 0
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- Frame generation ---
+    def _advance_sticks(self, now):
+        if self.script:
+            if self._script_start is None:
+                self._script_start = now
+            total = sum(duration for duration, _ in self.script)
+            t = (now - self._script_start) % total
+            for duration, values in self.script:
+                if t < duration:
+                    self.sticks = list(values)
+                    return
+                t -= duration
+        else:
+            # Random walk, clamped to the normalized range
+            for i, value in enumerate(self.sticks):
+                value += self.rng.uniform(-0.05, 0.05)
+                self.sticks[i] = max(-1.0, min(1.0, value))
+
+    def stick_frame(self, dst, seq, sticks=None):
+        sticks = self.sticks if sticks is None else sticks
+        payload = bytearray(self.payload_size)
+        for slot, packer, offset, field in self._fields:
+            packer.pack_into(payload, offset, field.center + round(sticks[slot] * field.throw))
+        return build_frame(self.device_address, dst, seq, TYPE_REPLY, CMD_SET_SIM, CMD_STICKS, payload)
+
+    def status_frame(self, size):
+        payload = bytes(self.rng.getrandbits(8) for _ in range(size - 13))
+        return build_frame(self.device_address, 0x0a, self._next_seq(), 0x00, 0x00, 0x01, payload)
+
+    def _next_seq(self):
+        self._seq = (self._seq + 1) & 0xFFFF
+        return self._seq
+
+    def _send(self, frame):
+        frame = bytearray(frame)
+        if self.corrupt and self.rng.random() < self.corrupt:
+            frame[self.rng.randrange(len(frame))] ^= 1 << self.rng.randrange(8)
+            self.corrupted += 1
+        if self.partial and self.rng.random() < self.partial:
+            frame = frame[:self.rng.randrange(1, len(frame))]
+            self.truncated += 1
+        os.write(self.master, frame)
+
+    # --- Incoming packets ---
+    def _handle(self, frame):
+        if len(frame) < 11 or frame[9] != CMD_SET_SIM:
+            return
+        src, seq, cmd_id = frame[4], frame[6] | (frame[7] << 8), frame[10]
+        if cmd_id == CMD_ENABLE:
+            self.enabled = True
+            self._send(build_frame(self.device_address, src, seq, TYPE_REPLY, CMD_SET_SIM, CMD_ENABLE, b'\x00'))
+        elif cmd_id == CMD_STICKS:
+            self.requests_seen += 1
+            now = time.perf_counter()
+            if self.reply_rate:
+                if now < self._next_reply:
+                    self.requests_ignored += 1
+                    return
+                self._next_reply = now + 1.0 / self.reply_rate
+            if self.latency:
+                self._replies.append((now + self.latency, self.stick_frame(src, seq)))
+            else:
+                self._send(self.stick_frame(src, seq))
+                self.frames_sent += 1
+
+    def _tick(self, now):
+        self._advance_sticks(now)
+        if self.stream:
+            self._send(self.stick_frame(0x0a, self._next_seq()))
+            self.frames_sent += 1
+        if self.status and self.rng.random() < 0.1:
+            self._send(self.status_frame(self.rng.choice(STATUS_SIZES)))
+            self.status_sent += 1
+
+    def _run(self):
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            wake = min(next_tick, self._replies[0][0]) if self._replies else next_tick
+            timeout = max(0.0, wake - time.perf_counter())
+            ready, _, _ = select.select([self.master], [], [], timeout)
+            if ready:
+                try:
+                    data = os.read(self.master, 4096)
+                except OSError:
+                    data = b''
+                if data:
+                    self.framer.write(data)
+                    for frame in self.framer.frames():
+                        self._handle(bytes(frame))
+
+            now = time.perf_counter()
+            replies = self._replies
+            while replies and replies[0][0] <= now:
+                self._send(replies.popleft()[1])
+                self.frames_sent += 1
+            if now >= next_tick:
+                self._tick(now)
+                next_tick += self.period
+                if now - next_tick > 1.0:
+                    next_tick = now  # Don't burst after a long stall
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="DumlSimulator", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def close(self):
+        self.stop()
+        os.close(self.master)
+        os.close(self.slave)
+
+    def summary(self):
+        return (f"requests: {self.requests_seen} | ignored: {self.requests_ignored} | frames sent: {self.frames_sent} | status: {self.status_sent} | "
+                f"corrupted: {self.corrupted} | truncated: {self.truncated}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DUML controller simulator on a pseudo-terminal")
+    parser.add_argument('--model', type=str, default='N1', choices=[name for name, entry in DRIVERS.items() if 'serial' in entry.dependencies],
+                        help='Controller whose stick layout is simulated (default: N1)')
+    parser.add_argument('--rate', type=int, default=100, help='Tick rate in Hz, up to 1000 (default: 100)')
+    parser.add_argument('--stream', action='store_true', help='Send stick frames every tick, not only as replies')
+    parser.add_argument('--corrupt', type=float, default=0.0, help='Probability of flipping a bit in a frame')
+    parser.add_argument('--partial', type=float, default=0.0, help='Probability of truncating a frame')
+    parser.add_argument('--status', action='store_true', help='Interleave 14/77-byte status packets')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds before a stick request is answered')
+    parser.add_argument('--reply-rate', type=float, default=None, help='Most stick requests answered per second')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    sim = DumlSimulator(rate_hz=min(args.rate, 1000), stream=args.stream, corrupt=args.corrupt,
+                        partial=args.partial, status=args.status, seed=args.seed,
+                        latency=args.latency, reply_rate=args.reply_rate, model=args.model)
+    sim.start()
+    print(f"Simulated controller on {sim.port}. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+            print(f"\r{sim.summary()}", end="", flush=True)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        sim.close()
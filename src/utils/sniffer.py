@@ -1,257 +1,388 @@
-# # # # import serial
-# # # # import struct
-# # # # import time
-
-
-
-
-
-# # # # # Set your identified port
-# # # # PORT = "COM5" 
-# # # # BAUD = 115200
-
-# # # # def print_header(length):
-# # # #     indices = " ".join(f"{i:02}" for i in range(length))
-# # # #     print("\nIndex:  " + indices)
-# # # #     print("-" * (length * 3 + 8))
-
-# # # # try:
-# # # #     s = serial.Serial(PORT, BAUD, timeout=0.1)
-# # # #     # Ping the M300 to start data flow (Source 01, Target 06)
-# # # #     s.write(bytearray.fromhex('550D04330106EB34400601552B'))
-    
-# # # #     print(f"Sniffing M300 on {PORT}...")
-# # # #     last_packet = []
-
-# # # #     while True:
-# # # #         # Send request for data
-# # # #         s.write(bytearray.fromhex('550D04330106EB34400601552B'))
-        
-# # # #         if s.read(1) == b'\x55':
-# # # #             header_partial = s.read(2)
-# # # #             if len(header_partial) < 2: continue
-            
-# # # #             # Calculate packet length from DUML header
-# # # #             length = struct.unpack('<H', header_partial)[0] & 0x3FF
-# # # #             remaining_data = s.read(length - 3)
-# # # #             full_packet = b'\x55' + header_partial + remaining_data
-            
-# # # #             # Print header once or when length changes
-# # # #             if len(full_packet) != len(last_packet):
-# # # #                 print_header(len(full_packet))
-            
-# # # #             output = []
-# # # #             for i, b in enumerate(full_packet):
-# # # #                 # Highlight bytes that changed since last read
-# # # #                 if len(last_packet) > i and b != last_packet[i]:
-# # # #                     output.append(f"[{b:02X}]")
-# # # #                 else:
-# # # #                     output.append(f" {b:02X} ")
-            
-# # # #             print(f"\rData: {''.join(output)}", end="", flush=True)
-# # # #             last_packet = list(full_packet)
-
-# # # #         time.sleep(0.02)
-
-# # # # except serial.SerialException as e:
-# # # #     print(f"\nError: Could not open {PORT}. Make sure DJI Assistant is closed.")
-# # # # except KeyboardInterrupt:
-# # # #     print("\nStopped.")
-# # # # finally:
-    
-# # # #     if 's' in locals(): s.close()
-
-
-
-
-# # # import serial
-# # # import time
-
-# # # # Use your identified port
-# # # s = serial.Serial("COM5", 115200, timeout=0.1)
-
-# # # # 1. Packet to identify the PC as a Mobile App (Source 0x01)
-# # # # 2. Packet to Enter Simulator Mode
-# # # # 3. Packet to Request Stick Data
-# # # init_sequence = [
-# # #     '550E04660106EB34000700010000', # Handshake / App ID
-# # #     '550E04660106EB340A062401552B', # Enter Simulator Mode
-# # #     '550D04330106EB34400601552B'  # Request Stick Data
-# # # ]
-
-# # # print("Starting M300 Enterprise Initialization...")
-
-# # # try:
-# # #     for cmd in init_sequence:
-# # #         s.write(bytearray.fromhex(cmd))
-# # #         time.sleep(0.2)
-# # #         print(f"Sent: {cmd[:10]}...")
-
-# # #     while True:
-# # #         # Request data every loop
-# # #         s.write(bytearray.fromhex('550D04330106EB34400601552B'))
-        
-# # #         if s.in_waiting > 0:
-# # #             b = s.read(1)
-# # #             if b == b'\x55':
-# # #                 header = s.read(2)
-# # #                 length = (header[0] | (header[1] << 8)) & 0x3FF
-# # #                 payload = s.read(length - 3)
-# # #                 full = b'\x55' + header + payload
-                
-# # #                 # Format for display
-# # #                 hex_str = ' '.join(f'{x:02X}' for x in full)
-# # #                 print(f"\r[{len(full)} bytes] {hex_str[:60]}...", end="")
-        
-# # #         time.sleep(0.01)
-
-# # # except KeyboardInterrupt:
-# # #     print("\nStopping...")
-# # # finally:
-# # #     s.close()
-
-
-# # import serial
-# # import struct
-# # import time
-# # import os
-
-# # PORT = "COM5"
-# # BAUD = 115200
-
-# # def clear():
-# #     os.system('cls' if os.name == 'nt' else 'clear')
-
-# # try:
-# #     s = serial.Serial(PORT, BAUD, timeout=0.1)
-    
-# #     # Store the latest packets
-# #     packets = {14: None, 77: None, "other": None}
-    
-# #     print(f"Listening on {PORT}... Move sticks/switches to see if bytes change.")
-
-# #     while True:
-# #         # Request data (The M300 poll command)
-# #         s.write(bytearray.fromhex('550D04330106EB34400601552B'))
-        
-# #         if s.in_waiting > 0:
-# #             char = s.read(1)
-# #             if char == b'\x55':
-# #                 header = s.read(2)
-# #                 if len(header) < 2: continue
-# #                 length = (header[0] | (header[1] << 8)) & 0x3FF
-# #                 payload = s.read(length - 3)
-# #                 full = b'\x55' + header + payload
-                
-# #                 # Categorize the packet
-# #                 p_len = len(full)
-# #                 if p_len in [14, 77]:
-# #                     packets[p_len] = full
-# #                 else:
-# #                     packets["other"] = full
-
-# #                 # Update Display
-# #                 print("\033[H", end="") # Move cursor to top
-# #                 print(f"=== M300 PACKET MONITOR [PORT: {PORT}] ===")
-                
-# #                 # Print 14-byte Heartbeat
-# #                 if packets[14]:
-# #                     hex_14 = ' '.join(f'{x:02X}' for x in packets[14])
-# #                     print(f"\n[14 Byte Heartbeat]:\n{hex_14}")
-                
-# #                 # Print 77-byte System Status
-# #                 if packets[77]:
-# #                     hex_77 = ' '.join(f'{x:02X}' for x in packets[77])
-# #                     # Split into lines for readability
-# #                     print(f"\n[77 Byte Status]:")
-# #                     print(hex_77[:57]) # First part
-# #                     print(hex_77[57:]) # Second part
-
-# #                 # Print if a new packet type appears (the stick data we want!)
-# #                 if packets["other"]:
-# #                     p_other = packets["other"]
-# #                     print(f"\n\033[92m[NEW PACKET DETECTED - {len(p_other)} Bytes]:\033[0m")
-# #                     print(' '.join(f'{x:02X}' for x in p_other))
-
-# #         time.sleep(0.01)
-
-# # except KeyboardInterrupt:
-# #     print("\nStopped.")
-# # finally:
-# #     s.close()
-
-
-
-
-# import serial
-# import time
-
-# s = serial.Serial("COM5", 115200, timeout=0.1)
-
-# # M300 Activation Pings
-# s.write(bytearray.fromhex('550E04660106EB34000700010000'))
-# s.write(bytearray.fromhex('550E04660106EB340A062401552B'))
-
-# try:
-#     while True:
-#         # Keep asking for sticks
-#         s.write(bytearray.fromhex('550D04330106EB34400601552B'))
-        
-#         if s.in_waiting > 0:
-#             char = s.read(1)
-#             if char == b'\x55':
-#                 header = s.read(2)
-#                 if len(header) < 2: continue
-#                 length = (header[0] | (header[1] << 8)) & 0x3FF
-#                 payload = s.read(length - 3)
-#                 full = b'\x55' + header + payload
-                
-#                 # Simple raw print: [Length] HexData
-#                 if len(full) == 14:
-#                     print(f"[{len(full):02d}] {' '.join(f'{x:02X}' for x in full)}")
-        
-#         time.sleep(0.01)
-# except KeyboardInterrupt:
-#     s.close()
-
-
-
-
-import serial
+"""
+DUML protocol sniffer: records a controller's serial traffic to a capture file
+and finds where a new model puts its sticks and buttons.
+
+    python -m src.utils.sniffer record --model M300 --port COM5 --out m300.djrc --guided
+    python -m src.utils.sniffer analyze m300.djrc
+
+record streams every frame to disk (same format as --capture). With --guided
+it walks through a script ("push the right stick up now") and stores a marker
+at every phase. analyze loads the capture as one NumPy array per frame length,
+reports per-byte variance and change frequency, and correlates every 16-bit
+word and every bit with the guided phases to suggest AxisField offsets.
+
+NumPy is only needed by analyze.
+"""
+import argparse
 import time
 
-s = serial.Serial("COM5", 115200, timeout=0.1)
-
-# This is the "Master Activation" for M300 Enterprise
-# It tells the RC: "I am a high-priority SDK device, send me everything."
-master_ping = bytearray.fromhex('550E04660106EB34000700010000')
-enable_sticks = bytearray.fromhex('550D04330106EB34400601552B')
-
-print("Sending M300 Force-Enable...")
-s.write(master_ping)
-time.sleep(0.5)
-
 try:
-    while True:
-        # Polling command
-        s.write(enable_sticks)
-        
-        if s.in_waiting > 0:
-            char = s.read(1)
-            if char == b'\x55':
-                header = s.read(2)
-                length = (header[0] | (header[1] << 8)) & 0x3FF
-                payload = s.read(length - 3)
-                full = b'\x55' + header + payload
-                
-                # Check the 77-byte packet specifically
-                if len(full) == 77:
-                    # Monitor the bytes at index 14, 15, 16, 17
-                    # In M300 Enterprise, sticks often shift here
-                    sticks_segment = full[14:30]
-                    hex_seg = ' '.join(f'{x:02X}' for x in sticks_segment)
-                    print(f"\rStick Segment [14-30]: {hex_seg}", end="")
-        
-        time.sleep(0.01)
-except KeyboardInterrupt:
-    s.close()
\ No newline at end of file
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.utils.capture import CaptureReader, CaptureWriter, KIND_DUML, KIND_MARKER
+from src.utils.duml import DumlFramer
+
+# --- Guided session ---
+# (marker, prompt). Every movement is preceded by a rest phase so transitions are clean.
+MOVEMENTS = (
+    ('axis:pitch:+1',    "Push the RIGHT stick UP and hold it"),
+    ('axis:pitch:-1',    "Pull the RIGHT stick DOWN and hold it"),
+    ('axis:roll:+1',     "Push the RIGHT stick RIGHT and hold it"),
+    ('axis:roll:-1',     "Push the RIGHT stick LEFT and hold it"),
+    ('axis:throttle:+1', "Push the LEFT stick UP and hold it"),
+    ('axis:throttle:-1', "Pull the LEFT stick DOWN and hold it"),
+    ('axis:yaw:+1',      "Push the LEFT stick RIGHT and hold it"),
+    ('axis:yaw:-1',      "Push the LEFT stick LEFT and hold it"),
+    ('axis:tilt:+1',     "Turn the camera WHEEL right and hold it"),
+    ('axis:tilt:-1',     "Turn the camera WHEEL left and hold it"),
+    ('button:button1',   "Hold button 1 (C1)"),
+    ('button:button2',   "Hold button 2 (C2 / pause)"),
+    ('button:button3',   "Hold button 3 (shutter / trigger)"),
+    ('button:button4',   "Hold button 4 (record / start-stop)"),
+)
+
+REST = 'rest'
+SETTLE = 0.5   # Seconds ignored at the start of every phase (reaction time)
+CHUNK = 1 << 18  # Rows per block, bounds the float temporaries on huge captures
+CRC_SIZE = 2     # Trailing CRC16 of every DUML frame, excluded from the candidates
+MIN_CORRELATION = 0.5  # Weaker matches are reported but never suggested
+
+
+def guide_steps(hold=3.0, rest=2.0):
+    steps = [(REST, "Leave every stick centered and release all buttons", rest)]
+    for marker, prompt in MOVEMENTS:
+        steps.append((marker, prompt, hold))
+        steps.append((REST, "Release everything", rest))
+    return steps
+
+
+# --- Recording ---
+def record(ser, path, request=b'', init=(), rate=100, guided=False, duration=None):
+    """
+    Streams every frame from an open serial port into a capture file.
+    Runs until the guide is over, `duration` elapsed or Ctrl+C.
+    """
+    writer = CaptureWriter(path, 'sniffer')
+    framer = DumlFramer()
+    for packet in init:
+        ser.write(packet)
+        time.sleep(0.2)
+
+    steps = guide_steps() if guided else []
+    step_index = -1
+    step_end = time.monotonic()
+    stop_at = time.monotonic() + duration if duration else None
+    period = 1.0 / rate
+    frames = 0
+    try:
+        while True:
+            now = time.monotonic()
+            if steps and now >= step_end:
+                step_index += 1
+                if step_index >= len(steps):
+                    break
+                marker, prompt, length = steps[step_index]
+                writer.mark(marker)
+                print(f"[{step_index + 1}/{len(steps)}] {prompt} ({length:g} s)")
+                step_end = now + length
+            if stop_at and now >= stop_at:
+                break
+
+            if request:
+                ser.write(request)
+            framer.feed(ser)
+            for frame in framer.frames():
+                writer.write(KIND_DUML, frame)
+                frames += 1
+            if not steps:
+                print(f"\r{frames} frames", end="", flush=True)
+            time.sleep(period)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.mark('end')
+        writer.close()
+    print(f"\nRecorded {frames} frames to {path}")
+    return frames
+
+
+# --- Loading ---
+RECORD_DTYPE = [('timestamp', '<f8'), ('kind', 'u1'), ('offset', '<i8'), ('length', '<i8')]
+
+
+class FrameGroup:
+    """All frames of one length: frames is (n, length) uint8, timestamps (n,) float64."""
+    def __init__(self, length, timestamps, frames):
+        self.length = length
+        self.timestamps = timestamps
+        self.frames = frames
+
+
+def load_capture(path):
+    """
+    Returns: ({length: FrameGroup}, [(timestamp, marker), ...])
+    The record headers are walked once in Python, the payload bytes are
+    gathered per length with one fancy-indexing copy out of the mmap.
+    """
+    if np is None:
+        raise RuntimeError("The sniffer analysis needs NumPy (pip install numpy)")
+
+    reader = CaptureReader(path)
+    try:
+        view = reader._view
+        records = np.fromiter(reader.records(), dtype=RECORD_DTYPE)
+        markers = [(float(timestamp), bytes(view[offset:offset + length]).decode())
+                   for timestamp, _, offset, length in records[records['kind'] == KIND_MARKER].tolist()]
+        records = records[records['kind'] == KIND_DUML]
+
+        data = np.frombuffer(reader._map, dtype=np.uint8)
+        timestamps = records['timestamp']
+        offsets = records['offset']
+        lengths = records['length']
+
+        groups = {}
+        for length in np.unique(lengths):
+            rows = np.flatnonzero(lengths == length)
+            index = offsets[rows, None] + np.arange(length)
+            groups[int(length)] = FrameGroup(int(length), timestamps[rows], data[index])
+        del data  # The map can only be closed once no array points into it
+    finally:
+        reader.close()
+    return groups, markers
+
+
+# --- Statistics ---
+def words(frames):
+    """Little-endian uint16 at every byte offset: (n, length) -> (n, length - 1)."""
+    return frames[:, :-1].astype(np.uint16) | (frames[:, 1:].astype(np.uint16) << 8)
+
+
+def byte_stats(frames):
+    """Per-byte variance and fraction of frames where the byte changed, in row blocks."""
+    n, length = frames.shape
+    total = np.zeros(length)
+    total_sq = np.zeros(length)
+    changes = np.zeros(length, dtype=np.int64)
+    for start in range(0, n, CHUNK):
+        block = frames[start:start + CHUNK + 1]  # One row of overlap for the diff
+        values = block[:CHUNK].astype(np.float64)
+        total += values.sum(axis=0)
+        total_sq += (values * values).sum(axis=0)
+        changes += np.count_nonzero(block[1:] != block[:-1], axis=0)
+    mean = total / n
+    variance = total_sq / n - mean * mean
+    return np.maximum(variance, 0.0), changes / max(n - 1, 1)
+
+
+def phase_moments(columns, phases, binary=False):
+    """
+    {marker: (frame count, column sums, column sums of squares)}. Every guided
+    target is constant within a phase, so these are all correlate() needs and
+    the columns are only read once whatever the number of targets.
+    binary: columns only hold 0/1 (unpacked bits), the squares are the sums.
+    """
+    moments = {}
+    for label, mask in phases.items():
+        rows = np.flatnonzero(mask)
+        total = np.zeros(columns.shape[1])
+        total_sq = np.zeros(columns.shape[1])
+        for start in range(0, len(rows), CHUNK):
+            block = columns[rows[start:start + CHUNK]]
+            if binary:
+                total += block.sum(axis=0, dtype=np.int64)
+            else:
+                x = block.astype(np.float64)
+                total += x.sum(axis=0)
+                total_sq += (x * x).sum(axis=0)
+        moments[label] = (len(rows), total, total if binary else total_sq)
+    return moments
+
+
+def correlate(moments, targets):
+    """
+    Pearson r of every column with a target that is targets[marker] during that
+    marker's phases (frames of other phases are left out). 0 for constant columns.
+    """
+    n = st = stt = 0.0
+    sx = sxx = sxt = 0.0
+    for label, t in targets.items():
+        if label not in moments:
+            continue
+        count, total, total_sq = moments[label]
+        n += count
+        st += t * count
+        stt += t * t * count
+        sx = sx + total
+        sxx = sxx + total_sq
+        sxt = sxt + t * total
+    var_x = np.maximum(sxx - sx * sx / n, 0.0)
+    var_t = max(stt - st * st / n, 0.0)
+    denominator = np.sqrt(var_x * var_t)
+    constant = denominator < 1e-9
+    r = (sxt - sx * st / n) / np.where(constant, 1.0, denominator)
+    r[constant] = 0.0
+    return r
+
+
+def phase_masks(timestamps, markers):
+    """
+    {marker: bool mask of the frames in its phases}. Frames before the first
+    marker and inside the settle time of a phase belong to none.
+    """
+    starts = np.array([ts for ts, _ in markers])
+    names = sorted({label for _, label in markers})
+    codes = np.array([names.index(label) for _, label in markers])
+    phase = np.searchsorted(starts, timestamps, side='right') - 1
+    valid = phase >= 0
+    valid[valid] = timestamps[valid] >= starts[phase[valid]] + SETTLE
+    labels = np.where(valid, codes[phase], -1)
+    return {label: labels == code for code, label in enumerate(names)}
+
+
+# --- Analysis ---
+def analyze_group(group, markers, top=3):
+    frames = group.frames
+    n, length = frames.shape
+    print(f"\n=== {length}-byte frames: {n} ===")
+
+    variance, change_rate = byte_stats(frames)
+    varying = np.flatnonzero(variance > 0)
+    print("Varying bytes (offset: variance / change rate):")
+    for offset in varying[np.argsort(-variance[varying])][:16]:
+        print(f"  {offset:3d}: {variance[offset]:10.1f} / {change_rate[offset]:6.1%}")
+    if all(label != REST for _, label in markers):
+        return {}  # Not a guided session
+
+    phases = phase_masks(group.timestamps, markers)
+    nothing = np.zeros(n, dtype=bool)
+    rest = phases.get(REST, nothing)
+    if not rest.any():
+        print("No rest frames in this group, skipping correlation.")
+        return {}
+
+    word_columns = words(frames)
+    word_moments = phase_moments(word_columns, phases)
+    bit_moments = phase_moments(np.unpackbits(frames, axis=1, bitorder='little'), phases, binary=True)
+
+    # The trailing CRC16 changes with every frame, it is never a stick or button
+    word_limit = length - 1 - CRC_SIZE
+    found = {}
+    correlations = {}
+    for marker, _ in MOVEMENTS:
+        kind, name, *direction = marker.split(':')
+        if kind == 'axis':
+            if direction[0] != '+1':
+                continue
+            plus = phases.get(f'axis:{name}:+1', nothing)
+            minus = phases.get(f'axis:{name}:-1', nothing)
+            if not (plus.any() or minus.any()):
+                continue
+            r = correlate(word_moments, {REST: 0.0, f'axis:{name}:+1': 1.0, f'axis:{name}:-1': -1.0})
+            r[word_limit:] = 0.0
+            correlations[name] = (r, plus, minus)
+        else:
+            held = phases.get(marker, nothing)
+            if not held.any():
+                continue
+            r = correlate(bit_moments, {REST: 0.0, marker: 1.0})
+            r[8 * (length - CRC_SIZE):] = 0.0
+            best = int(np.argmax(np.abs(r)))
+            if abs(r[best]) < MIN_CORRELATION:
+                print(f"  {name:9s} not found (best byte {best // 8} bit {best % 8}, r={r[best]:+.2f})")
+                continue
+            found[name] = (best // 8, best % 8, float(r[best]))
+            print(f"  {name:9s} byte {best // 8} bit {best % 8} (r={r[best]:+.2f})")
+
+    # Strongest axes pick first, a word can't share a byte with one already taken
+    taken = set()
+    axes = {}
+    for name in sorted(correlations, key=lambda name: -np.abs(correlations[name][0]).max()):
+        r, plus, minus = correlations[name]
+        ranked = np.argsort(-np.abs(r))
+        candidates = ', '.join(f"{o} (r={r[o]:+.2f})" for o in ranked[:top])
+        offset = next((int(o) for o in ranked
+                       if abs(r[o]) >= MIN_CORRELATION and not {o, o + 1} & taken), None)
+        if offset is None:
+            print(f"  {name:9s} not found (best word offsets {candidates})")
+            continue
+        taken.update((offset, offset + 1))
+        column = word_columns[:, offset]
+        center = int(np.median(column[rest]))
+        # Mean of both directions' median deflection; one direction is enough
+        throws = [abs(int(np.median(column[held])) - center) for held in (plus, minus) if held.any()]
+        throw = round(sum(throws) / len(throws))
+        axes[name] = found[name] = (offset, center, throw, float(r[offset]))
+        print(f"  {name:9s} word offset {offset}, candidates {candidates}  center {center} throw {throw}")
+
+    if not axes:
+        print("No stick axes found.")
+        return found
+    # Stick replies share their length with whatever else the RC sends, pin the command too
+    commands, counts = np.unique(frames[:, 9].astype(np.uint16) << 8 | frames[:, 10], return_counts=True)
+    command = int(commands[np.argmax(counts)])
+    print("Suggested layout:")
+    print(f"    LAYOUT = PacketLayout({length}, [")
+    for name, (offset, center, throw, r) in sorted(axes.items(), key=lambda item: item[1][0]):
+        zone = ", zone='elevation'" if name == 'throttle' else ''
+        sign = '' if r > 0 else '  # inverted'
+        print(f"        AxisField('{name}', {offset}, center={center}, throw={throw}{zone}),{sign}")
+    print(f"    ], command=(0x{command >> 8:02x}, 0x{command & 0xFF:02x}))")
+    return found
+
+
+def analyze(path, length=None):
+    start = time.perf_counter()
+    groups, markers = load_capture(path)
+    total = sum(len(group.timestamps) for group in groups.values())
+    print(f"Loaded {total} frames in {len(groups)} length groups, {len(markers)} markers "
+          f"({time.perf_counter() - start:.2f} s)")
+
+    results = {}
+    for group_length, group in sorted(groups.items()):
+        if length is not None and group_length != length:
+            continue
+        results[group_length] = analyze_group(group, markers)
+    print(f"Done in {time.perf_counter() - start:.2f} s")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DUML protocol sniffer")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rec = commands.add_parser('record', help='Stream a controller\'s frames to a capture file')
+    rec.add_argument('--port', required=True)
+    rec.add_argument('--baudrate', type=int, default=115200)
+    rec.add_argument('--out', required=True, metavar='PATH')
+    rec.add_argument('--model', default=None, help='Send this driver\'s enable/request packets (e.g. M300)')
+    rec.add_argument('--send', action='append', default=[], metavar='HEX', help='Extra packet sent once at start')
+    rec.add_argument('--request', default=None, metavar='HEX', help='Packet sent every poll (overrides --model)')
+    rec.add_argument('--rate', type=int, default=100, help='Polls per second (default: 100)')
+    rec.add_argument('--guided', action='store_true', help='Walk through the stick/button script and mark every phase')
+    rec.add_argument('--duration', type=float, default=None, help='Stop after SECONDS (unguided)')
+
+    ana = commands.add_parser('analyze', help='Find axis and button offsets in a capture')
+    ana.add_argument('path')
+    ana.add_argument('--length', type=int, default=None, help='Only analyze frames of this length')
+
+    args = parser.parse_args()
+    if args.command == 'analyze':
+        analyze(args.path, args.length)
+    else:
+        import serial
+
+        init = [bytes.fromhex(packet) for packet in args.send]
+        request = b''
+        if args.model:
+            from src.remote_controller.registry import load_driver
+            driver = load_driver(args.model)
+            init.insert(0, getattr(driver, 'ENABLE_PACKET', b''))
+            request = getattr(driver, 'REQUEST_PACKET', b'')
+        if args.request:
+            request = bytes.fromhex(args.request)
+
+        with serial.Serial(args.port, args.baudrate, timeout=0) as ser:
+            record(ser, args.out, request=request, init=[p for p in init if p], rate=args.rate,
+                   guided=args.guided, duration=args.duration)
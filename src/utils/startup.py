@@ -0,0 +1,35 @@
+import time
+from contextlib import contextmanager
+
+# Taken when this module is first imported, main.py imports it before anything heavy
+PROCESS_START = time.perf_counter()
+
+
+class StartupProfile:
+    """Records how long each import/init step takes on the way to the first frame."""
+    def __init__(self):
+        self.entries = []  # (label, seconds, seconds since process start at the end)
+
+    @contextmanager
+    def measure(self, label):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.entries.append((label, end - start, end - PROCESS_START))
+
+    def mark(self, label):
+        """A point in time without a duration, e.g. the first frame."""
+        now = time.perf_counter()
+        self.entries.append((label, None, now - PROCESS_START))
+
+    def report(self):
+        lines = ["--- Startup profile ---"]
+        for label, duration, at in self.entries:
+            took = f"{duration * 1000:8.1f} ms" if duration is not None else " " * 11
+            lines.append(f"{label:<40} {took}   @ {at * 1000:8.1f} ms")
+        return '\n'.join(lines)
+
+
+PROFILE = StartupProfile()
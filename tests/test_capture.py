@@ -0,0 +1,47 @@
+import pytest
+
+from src.remote_controller import calibration
+from src.remote_controller.calibration import AxisCalibration, save_calibration
+from src.remote_controller.dji_rcN1 import DJIRCN1
+from src.remote_controller.replay import ReplayController
+from src.utils.capture import CaptureReader, CaptureWriter, HEADER, MAGIC, KIND_DUML
+from src.utils.duml import build_frame
+
+
+@pytest.mark.parametrize('content', [b'', b'DJ', b'NOPE\x01\x00', MAGIC + b'\x02\x20DJIRC', MAGIC + b'\x02\x07DJIRCN1'])
+def test_truncated_or_foreign_files_raise_value_error(tmp_path, content):
+    path = tmp_path / 'bad.djrc'
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        CaptureReader(str(path))
+
+
+def test_version_1_captures_still_load(tmp_path):
+    path = tmp_path / 'v1.djrc'
+    path.write_bytes(HEADER.pack(MAGIC, 1, 7) + b'DJIRCN1')
+    reader = CaptureReader(str(path))
+    assert (reader.model, reader.calibration_key) == ('DJIRCN1', None)
+    assert list(reader) == []
+    reader.close()
+
+
+def test_replay_uses_the_recorded_units_calibration(tmp_path, monkeypatch):
+    monkeypatch.setattr(calibration, 'CALIBRATION_FILE', str(tmp_path / 'calibration.json'))
+    key = 'DJIRCN1:0123456789'
+    # This unit's roll reaches full deflection at 1024 + 330
+    save_calibration(key, {'roll': AxisCalibration(1024 - 330, 1024, 1024 + 330)})
+
+    payload = bytearray(25)
+    payload[2:4] = (1024 + 330).to_bytes(2, 'little')
+    for offset in (5, 8, 11, 14):
+        payload[offset:offset + 2] = (1024).to_bytes(2, 'little')
+    path = str(tmp_path / 'session.djrc')
+    writer = CaptureWriter(path, 'DJIRCN1', key)
+    writer.write(KIND_DUML, build_frame(0x06, 0x0a, 1, 0x80, 0x06, 0x01, payload))
+    writer.close()
+
+    replay = ReplayController(path, realtime=False)
+    assert replay.calibration_key == key
+    assert replay.update()
+    assert replay.roll == 1.0
+    replay.close()
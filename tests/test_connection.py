@@ -0,0 +1,26 @@
+import pytest
+from types import SimpleNamespace
+
+serial = pytest.importorskip('serial')
+import serial.tools.list_ports
+
+from src.remote_controller import connection
+from src.remote_controller.connection import claim_port, release_port, find_dji_ports
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch, tmp_path):
+    monkeypatch.setattr(connection, 'PORT_CACHE', str(tmp_path / 'ports.json'))
+    ports = [SimpleNamespace(device=f'/dev/ttyACM{i}', description='DJI USB VCOM For Protocol',
+                             vid=connection.DJI_VID, serial_number=None) for i in range(2)]
+    monkeypatch.setattr(serial.tools.list_ports, 'comports', lambda: ports)
+
+
+def test_discovery_skips_claimed_ports():
+    assert claim_port('/dev/ttyACM0')
+    try:
+        assert not claim_port('/dev/ttyACM0')
+        assert find_dji_ports('DJIRCN1') == ['/dev/ttyACM1']
+    finally:
+        release_port('/dev/ttyACM0')
+    assert find_dji_ports('DJIRCN1') == ['/dev/ttyACM0', '/dev/ttyACM1']
@@ -0,0 +1,16 @@
+from src.utils.duml import DumlFramer, build_frame
+
+
+def test_bad_crc_only_costs_its_own_frame():
+    good = build_frame(0x06, 0x0a, 1, 0x80, 0x06, 0x01, bytes(25))
+    bad = bytearray(build_frame(0x06, 0x0a, 2, 0x80, 0x06, 0x01, bytes(25)))
+    bad[20] ^= 0xFF
+    # Truncated frame whose declared length swallows the start of the next good one
+    truncated = good[:20]
+
+    framer = DumlFramer(verify_crc=True)
+    framer.write(bytes(bad) + good + truncated + good)
+    frames = [bytes(frame) for frame in framer.frames()]
+
+    assert frames == [good, good]
+    assert framer.crc_errors == 2
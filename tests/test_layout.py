@@ -0,0 +1,38 @@
+import struct
+
+from src.utils.duml import build_frame
+from src.remote_controller.dji_rcN1 import DJIRCN1
+from src.remote_controller.dji_m300 import DJIM300
+
+
+def frame_with(**raw):
+    frame = bytearray(DJIRCN1.LAYOUT.frame_size)
+    frame[0] = 0x55
+    for field in DJIRCN1.LAYOUT.axes:
+        struct.pack_into('<H', frame, field.offset, raw.get(field.name, field.center))
+    return bytes(frame)
+
+
+def test_out_of_range_raw_saturates():
+    decoder = DJIRCN1.LAYOUT.compile({'movement': 0.1, 'elevation': 0.1})
+    roll, pitch, throttle, yaw, tilt = decoder.decode(frame_with(roll=2100, pitch=0xFFFF))
+    assert roll == 1.0
+    assert pitch == 1.0
+    assert throttle == yaw == tilt == 0.0
+
+
+def test_m300_ignores_long_frames_of_other_commands():
+    layout = DJIM300.LAYOUT
+    status = build_frame(0x06, 0x0a, 1, 0x00, 0x00, 0x01, bytes(64))
+    sticks = build_frame(0x06, 0x0a, 2, 0x80, 0x06, 0x01, bytes(25))
+    assert len(status) == 77
+    assert not layout.matches(status)
+    assert layout.matches(sticks)
+    assert not layout.matches(sticks[:26])
+
+
+def test_curves_are_folded_into_the_tables():
+    decoder = DJIRCN1.LAYOUT.compile({'movement': 0.0, 'elevation': 0.0}, curves={'yaw': 2.0})
+    roll, pitch, throttle, yaw, tilt = decoder.decode(frame_with(roll=1024 + 330, yaw=1024 - 330))
+    assert roll == 0.5
+    assert yaw == -0.25
@@ -0,0 +1,101 @@
+import pytest
+
+from src.remote_controller import multi
+from src.remote_controller.multi import MultiController
+
+
+class FakeButtons:
+    def __init__(self):
+        self.pressed = 0
+
+
+class FakeRC:
+    supports_acquisition = False
+    is_connected = True
+
+    def __init__(self):
+        self.roll = self.pitch = self.throttle = self.yaw = self.tilt = 0.0
+        self.sw1 = self.sw2 = 0
+        self.buttons = FakeButtons()
+
+    def update(self):
+        return True
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, rc):
+        self.rc = rc
+
+    def connect(self, retry_limit=None):
+        return self.rc
+
+    def poll(self):
+        return self.rc
+
+    def start_reconnect(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(multi.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def make_multi(*rcs):
+    members = [(f"rc{index}", FakeConnection(rc)) for index, rc in enumerate(rcs)]
+    return MultiController(members, policy='priority', idle_timeout=0.5, activity_threshold=0.1)
+
+
+def test_parked_tilt_and_switches_do_not_hold_control(clock):
+    pilot, observer = FakeRC(), FakeRC()
+    # RC3 at rest: tilt wheel and switch report -1
+    pilot.tilt = -1.0
+    pilot.sw2 = -1
+    controller = make_multi(pilot, observer)
+
+    observer.roll = 0.5
+    controller.update()
+    assert controller.owner == 1
+    assert controller.roll == 0.5
+
+
+def test_resting_stick_noise_does_not_take_control(clock):
+    pilot, observer = FakeRC(), FakeRC()
+    controller = make_multi(pilot, observer)
+    observer.roll = 0.5
+    controller.update()
+
+    pilot.yaw = 0.05
+    controller.update()
+    assert controller.owner == 1
+
+    pilot.yaw = 0.3
+    controller.update()
+    assert controller.owner == 0
+
+
+def test_only_button_presses_count_as_activity(clock):
+    pilot, observer = FakeRC(), FakeRC()
+    controller = make_multi(pilot, observer)
+    pilot.buttons.pressed = 0b0001
+    controller.update()
+    assert controller.owner == 0
+
+    # Still held, but the press was too long ago
+    clock[0] += 1.0
+    observer.pitch = -0.8
+    controller.update()
+    assert controller.owner == 1
+
+    # A new press takes control back
+    pilot.buttons.pressed = 0b0011
+    controller.update()
+    assert controller.owner == 0
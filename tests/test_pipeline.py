@@ -0,0 +1,24 @@
+from src.remote_controller.dji_rcN1 import DJIRCN1
+from src.remote_controller.pipeline import RequestPipeline
+
+
+def test_interval_never_exceeds_max_on_a_slow_link():
+    pipeline = RequestPipeline(DJIRCN1.REQUEST_PACKET, depth=2, max_interval=0.02, window=0.5)
+    now = 0.0
+    pipeline.expire(now)
+    # Every request is lost until the interval backed off to max_interval
+    for _ in range(5):
+        while pipeline.due(now):
+            pipeline.next_request(now)
+        now += 0.5
+        pipeline.expire(now)
+    assert pipeline._lossy_interval == pipeline.max_interval
+
+    # Then a reply takes 100 ms: latency / depth is past max_interval as well
+    for _ in range(5):
+        while pipeline.due(now):
+            frame = pipeline.next_request(now)
+            pipeline.on_reply(frame, now + 0.1)
+        now += 0.5
+        pipeline.expire(now)
+        assert pipeline.interval <= pipeline.max_interval
@@ -0,0 +1,41 @@
+import time
+
+import pytest
+
+pytest.importorskip('serial')
+
+from src.remote_controller import calibration, connection
+from src.remote_controller.registry import load_driver
+from src.utils.simulator import DumlSimulator
+
+SCRIPT = [
+    (0.02, (0.5, -0.5, 0.25, -1.0, 1.0)),
+    (0.02, (-0.25, 1.0, -1.0, 0.5, 0.0)),
+    (0.02, (0.0, 0.0, 0.0, 0.0, -0.75)),
+]
+
+
+@pytest.mark.parametrize('model', ['N1', 'M300'])
+def test_corrupted_link_only_yields_injected_samples(model, monkeypatch, tmp_path):
+    monkeypatch.setattr(connection, 'PORT_CACHE', str(tmp_path / 'ports.json'))
+    monkeypatch.setattr(calibration, 'CALIBRATION_FILE', str(tmp_path / 'calibration.json'))
+    sim = DumlSimulator(rate_hz=500, stream=True, script=SCRIPT, corrupt=0.2, partial=0.2,
+                        status=True, seed=1, model=model)
+    sim.start()
+    rc = load_driver(model)(port=sim.port)
+    try:
+        expected = {rc.decoder.decode(sim.stick_frame(0x0a, 1, values)) for _, values in SCRIPT}
+        samples = []
+        deadline = time.monotonic() + 1.0
+        while time.monotonic() < deadline:
+            sample = rc.read_sample()
+            if sample is not None:
+                samples.append(sample)
+            time.sleep(0.002)
+    finally:
+        rc.close()
+        sim.close()
+
+    assert sim.corrupted and sim.truncated and sim.status_sent
+    assert rc.framer.crc_errors
+    assert set(samples) == expected
@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.keyboard.backends import UinputBackend, INPUT_EVENT, EV_KEY, EV_SYN, SYN_REPORT, UINPUT_KEYCODES
+
+
+def read_events(path):
+    data = path.read_bytes()
+    assert len(data) % INPUT_EVENT.size == 0
+    return [INPUT_EVENT.unpack_from(data, offset)[2:] for offset in range(0, len(data), INPUT_EVENT.size)]
+
+
+def test_one_frame_is_one_write_ending_in_syn_report(tmp_path):
+    path = tmp_path / 'events'
+    backend = UinputBackend(str(path))
+    up = SimpleNamespace(name='up')  # Like a pynput Key
+    backend.press('w')
+    backend.press(up)
+    assert path.read_bytes() == b''  # Buffered until the frame ends
+
+    backend.flush()
+    backend.release('w')
+    backend.close()
+
+    assert read_events(path) == [
+        (EV_KEY, UINPUT_KEYCODES['w'], 1),
+        (EV_KEY, UINPUT_KEYCODES['up'], 1),
+        (EV_SYN, SYN_REPORT, 0),
+        (EV_KEY, UINPUT_KEYCODES['w'], 0),
+        (EV_SYN, SYN_REPORT, 0),
+    ]
+
+
+def test_unknown_key_is_rejected(tmp_path):
+    backend = UinputBackend(str(tmp_path / 'events'))
+    with pytest.raises(ValueError):
+        backend.press('@')
+    backend.close()
+
+
+def test_missing_device_is_an_os_error(tmp_path):
+    with pytest.raises(OSError):
+        UinputBackend('/dev/no-such-uinput')